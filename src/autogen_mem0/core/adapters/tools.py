@@ -33,58 +33,61 @@ class AnthropicToolAdapter(ToolAdapter[Tool, Union[
 ]]):
     """Converts our tools to Anthropic beta tool format."""
 
-    def adapt(self, tools: List[Tool]) -> Union[
+    def adapt(self, tools: List[Tool]) -> List[Union[
         BetaToolParam,
         BetaToolComputerUse20241022Param,
         BetaToolBash20241022Param,
         BetaToolTextEditor20241022Param,
-    ]:
-        """Convert our tool to appropriate Anthropic format."""
-        anthropic_tools: List[BetaToolParam] = []
+    ]]:
+        """Convert our tools to appropriate Anthropic format.
+
+        Tools exposing a precomputed ``anthropic_schema`` (see ``BaseTool``) are
+        used as-is; other tools are converted from their schema.
+        """
+        anthropic_tools = []
         for tool in tools:
-            schema: ToolSchema = tool.schema
+            anthropic_tool = getattr(tool, "anthropic_schema", None)
+            if anthropic_tool is None:
+                anthropic_tool = self.adapt_schema(tool.schema)
+            anthropic_tools.append(anthropic_tool)
+        return anthropic_tools
 
-            # Special handling for computer-use tools
-            tool_type = schema.get("type")
-            if tool_type in ["computer_20241022", "text_editor_20241022", "bash_20241022"]:
-                beta_param = {
-                    "type": tool_type,
-                    "name": schema["name"]
-                }
-                # Add any additional computer-use specific parameters
-                for param in ["display_width_px", "display_height_px", "display_number"]:
-                    if param in schema:
-                        beta_param[param] = schema[param]
+    def adapt_schema(self, schema: ToolSchema) -> Union[
+        BetaToolParam,
+        BetaToolComputerUse20241022Param,
+        BetaToolBash20241022Param,
+        BetaToolTextEditor20241022Param,
+    ]:
+        """Convert a single tool schema to the Anthropic beta tool format."""
+        # Special handling for computer-use tools
+        tool_type = schema.get("type")
+        if tool_type in ["computer_20241022", "text_editor_20241022", "bash_20241022"]:
+            beta_param = {
+                "type": tool_type,
+                "name": schema["name"]
+            }
+            # Add any additional computer-use specific parameters
+            for param in ["display_width_px", "display_height_px", "display_number"]:
+                if param in schema:
+                    beta_param[param] = schema[param]
 
-                # Return appropriate computer-use param type
-                if tool_type == "computer_20241022":
-                    anthropic_tools.append(
-                        BetaToolComputerUse20241022Param(**beta_param)
-                    )
-                    continue
-                elif tool_type == "text_editor_20241022":
-                    anthropic_tools.append(
-                        BetaToolTextEditor20241022Param(**beta_param)
-                    )
-                    continue
-                elif tool_type =="bash_20241022": 
-                    anthropic_tools.append(
-                        BetaToolBash20241022Param(**beta_param)
-                    )
-                    continue
+            # Return appropriate computer-use param type
+            if tool_type == "computer_20241022":
+                return BetaToolComputerUse20241022Param(**beta_param)
+            elif tool_type == "text_editor_20241022":
+                return BetaToolTextEditor20241022Param(**beta_param)
             else:
-                anthropic_tool = BetaToolParam(
-                    name=schema["name"],
-                    description=schema.get("description", ""),
-                    input_schema={
-                        "type": "object",
-                        "properties": schema.get("parameters", {}).get("properties", {}),
-                        "required": schema.get("parameters", {}).get("required", []),
-                    },
-                )
-                anthropic_tools.append(anthropic_tool)
+                return BetaToolBash20241022Param(**beta_param)
 
-        return anthropic_tools
+        return BetaToolParam(
+            name=schema["name"],
+            description=schema.get("description", ""),
+            input_schema={
+                "type": "object",
+                "properties": schema.get("parameters", {}).get("properties", {}),
+                "required": schema.get("parameters", {}).get("required", []),
+            },
+        )
 
 class FunctionToolAdapter(ToolAdapter[Tool, FunctionTool]):
     """Converts our tools to autogen FunctionTool format for execution."""
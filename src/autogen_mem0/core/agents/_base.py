@@ -173,13 +173,13 @@ class MemoryEnabledAssistant(AssistantAgent):
         self._closed = False
 
         if config.memory_config:
-            print("DEBUG: Initializing memory configuration")
+            logger.debug("Initializing memory configuration")
             # Initialize memory through manager
             self._memory_manager = MemoryManager(ConfigManager())
 
             # Start conversation
             self._conversation_id = self._memory_manager.start_conversation()
-            print(f"DEBUG: Started conversation {self._conversation_id}")
+            logger.debug("Started conversation %s", self._conversation_id)
 
             # Initialize memory instance asynchronously
             self._memory_config = config.memory_config
@@ -231,11 +231,11 @@ These context values are fixed for the duration of our conversation and should b
         """Initialize memory instance asynchronously."""
         if self._memory_config:
 
-            print(f"DEBUG: Initializing memory for agent {self._agent_name}")
+            logger.debug("Initializing memory for agent %s", self._agent_name)
             self._memory = self._memory_manager.get_memory(self._agent_name, memory_config=self._memory_config)
             self._tools.append(StoreMemoryTool(self._memory))
             self._tools.append(RecallMemoryTool(self._memory))
-            print("DEBUG: Memory initialized")
+            logger.debug("Memory initialized")
 
         # Initialize AssistantAgent
         super().__init__(
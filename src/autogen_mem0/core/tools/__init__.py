@@ -14,6 +14,8 @@ from .common import (
     # Tools
     StoreMemoryTool,
     RecallMemoryTool,
+    StoreMemoryBatchTool,
+    RecallMemoryBatchTool,
     StoreRelationshipTool,
     UpdateRelationshipTool,
     GetRelatedEntitiesTool,
@@ -23,6 +25,10 @@ from .common import (
     RecallMemoryInput,
     StoreMemoryOutput,
     RecallMemoryOutput,
+    StoreMemoryBatchInput,
+    RecallMemoryBatchInput,
+    StoreMemoryBatchOutput,
+    RecallMemoryBatchOutput,
     StoreRelationshipInput,
     UpdateRelationshipInput,
     GetRelatedEntitiesInput,
@@ -46,6 +52,10 @@ __all__ = [
     "RecallMemoryTool",
     "StoreMemoryOutput",
     "RecallMemoryOutput",
+    "StoreMemoryBatchTool",
+    "RecallMemoryBatchTool",
+    "StoreMemoryBatchOutput",
+    "RecallMemoryBatchOutput",
     "StoreRelationshipTool",
     "UpdateRelationshipTool",
     "GetRelatedEntitiesTool",
@@ -54,6 +64,8 @@ __all__ = [
     # Memory Models
     "StoreMemoryInput",
     "RecallMemoryInput",
+    "StoreMemoryBatchInput",
+    "RecallMemoryBatchInput",
     "StoreRelationshipInput",
     "UpdateRelationshipInput",
     "GetRelatedEntitiesInput",
@@ -12,14 +12,55 @@ from anthropic.types.beta import (
 )
 from pydantic import BaseModel, create_model
 from typing import TypedDict, NotRequired
+import functools
 import json
+import logging
+
+try:
+    import msgspec
+except ImportError:  # Optional: faster argument parsing when installed
+    msgspec = None
 
 from ..adapters.tools import ToolAdapterFactory
 
+logger = logging.getLogger(__name__)
+
 ArgsT = TypeVar("ArgsT", bound=BaseModel)
 ReturnT = TypeVar("ReturnT")
 
 
+def _inline_refs(node: Any, defs: Dict[str, Any]) -> Any:
+    """Replace local ``#/$defs/...`` references with the definitions they point to."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and ref.startswith("#/$defs/"):
+            resolved = _inline_refs(defs[ref[len("#/$defs/"):]], defs)
+            # Keep keywords set next to the reference, such as a field description
+            siblings = {key: _inline_refs(value, defs) for key, value in node.items() if key != "$ref"}
+            return {**resolved, **siblings}
+        return {key: _inline_refs(value, defs) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_inline_refs(item, defs) for item in node]
+    return node
+
+
+@functools.lru_cache(maxsize=None)
+def model_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema of a pydantic model, computed once per model class.
+
+    Nested models are inlined rather than left as ``$defs`` references, since
+    tool schemas only carry the top-level properties and required fields.
+
+    Tool argument models are static, so modules defining them can call this at
+    import time and every tool instance reuses the result. Treat it as read-only.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", None)
+    if defs:
+        schema = _inline_refs(schema, defs)
+    return schema
+
+
 class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
     """Base class for all tools in autogen-mem0.
     
@@ -28,6 +69,7 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
     2. Support for computer-use tools
     3. Schema-based initialization
     4. Automatic input validation and serialization handling
+    5. Optional msgspec argument parsing via args_struct
     """
 
     def __init__(
@@ -37,6 +79,7 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
         return_type: Type[BaseModel] | Type[List[Dict[str, Any]]],
         name: str,
         description: str,
+        args_struct: Optional[type] = None,
     ):
         """Initialize the tool.
 
@@ -45,11 +88,17 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
             return_type: The type of the return value.
             name: The name of the tool.
             description: A description of what the tool does.
+            args_struct: Optional msgspec.Struct mirroring args_type. When msgspec
+                is installed, arguments are parsed with it and args_type is built
+                without re-validation; args_type still provides the schema.
         """
         self._args_type = args_type
+        self._args_struct = args_struct if msgspec is not None else None
         self._return_type = return_type
         self._name = name
         self._description = description
+        self._tool_schema: Optional[ToolSchema] = None
+        self._anthropic_schema: Optional[Dict[str, Any]] = None
 
     @property
     def name(self) -> str:
@@ -66,11 +115,35 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
         """Get tool schema.
         
         Returns original schema if tool was created from schema,
-        otherwise generates schema from type information.
+        otherwise builds it from the args model's cached JSON schema.
         """
         if hasattr(self, '_schema'):
             return self._schema
-        return super().schema
+        if self._tool_schema is None:
+            args_schema = model_json_schema(self._args_type)
+            tool_schema = ToolSchema(
+                name=self._name,
+                description=self._description,
+                parameters=ParametersSchema(
+                    type="object",
+                    properties=args_schema["properties"],
+                ),
+            )
+            if "required" in args_schema:
+                tool_schema["parameters"]["required"] = args_schema["required"]
+            self._tool_schema = tool_schema
+        return self._tool_schema
+
+    @property
+    def anthropic_schema(self) -> Dict[str, Any]:
+        """Get the Anthropic tool parameter for this tool.
+
+        Generated from the tool schema on first access and reused afterwards,
+        so the args model's JSON schema is only walked once per tool.
+        """
+        if self._anthropic_schema is None:
+            self._anthropic_schema = ToolAdapterFactory.get_adapter("anthropic").adapt_schema(self.schema)
+        return self._anthropic_schema
 
     def adapt(self, adapter_name: str): 
         adapter = ToolAdapterFactory.get_adapter(adapter_name)
@@ -79,6 +152,19 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
         else:
             raise ValueError(f"No adapter found for {adapter_name}")
 
+    def _parse_args(self, args: Union[Mapping[str, Any], str]) -> BaseModel:
+        """Parse raw tool arguments into an args_type instance."""
+        if self._args_struct is not None:
+            if isinstance(args, str):
+                parsed = msgspec.json.decode(args, type=self._args_struct, strict=False)
+            else:
+                parsed = msgspec.convert(args, type=self._args_struct, strict=False)
+            return self._args_type.model_construct(**msgspec.structs.asdict(parsed))
+
+        if isinstance(args, str):
+            args = json.loads(args)
+        return self._args_type.model_validate(args)
+
     async def run_json(
         self, args: Mapping[str, Any], cancellation_token: CancellationToken
     ) -> Any:
@@ -88,10 +174,8 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
         """
         try:
             # Handle both dict and string inputs
-            if isinstance(args, dict):
-                validated_args = self._args_type.model_validate(args)
-            elif isinstance(args, str):
-                validated_args = self._args_type.model_validate(json.loads(args))
+            if isinstance(args, (dict, str)):
+                validated_args = self._parse_args(args)
             else:
                 raise ValueError(f"Expected dict or str args, got {type(args)}")
 
@@ -99,9 +183,7 @@ class BaseTool(AutogenBaseTool[ArgsT, ReturnT], ABC):
             return return_value
 
         except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {e}")
-            print(f"Args type: {type(args)}")
-            print(f"Args content: {args}")
+            logger.debug("Error in %s: %s (args type %s): %r", self.__class__.__name__, e, type(args), args)
             raise
 
     def to_function_tool(self) -> FunctionTool:
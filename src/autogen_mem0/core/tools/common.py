@@ -1,15 +1,47 @@
 """Common tool implementations for autogen-mem0."""
 
-from typing import Any, Dict, List, Optional, Callable, Awaitable, Union
-from pydantic import BaseModel, Field
-from autogen_mem0.core.tools._base import BaseTool 
+import asyncio
+import copy
+import functools
+import inspect
+import os
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Callable, Awaitable, Union
+from pydantic import BaseModel, Field, model_validator
+from autogen_mem0.core.tools._base import BaseTool, model_json_schema
 from autogen_core.components.tools._base import CancellationToken
 
 from mem0 import Memory
 from mem0.configs.base import MemoryConfig
 import json
 
+try:
+    import msgspec
+except ImportError:  # Optional: tools fall back to pydantic argument parsing
+    msgspec = None
+
+# Default cap on rows returned by a pushed-down graph traversal
+_GRAPH_RESULT_LIMIT = 256
+
 # Input/Output Models
+class _ScopeFilters:
+    """Mixin for inputs carrying user_id/agent_id/run_id scope fields."""
+
+    def to_filters(self) -> Dict[str, str]:
+        """Return the scope fields that are set, as memory filters."""
+        return {
+            key: value
+            for key, value in (("user_id", self.user_id), ("agent_id", self.agent_id), ("run_id", self.run_id))
+            if value
+        }
+
+    def _require_scope(self):
+        if not (self.user_id or self.agent_id or self.run_id):
+            raise ValueError("At least one of user_id, agent_id, or run_id must be provided")
+        return self
+
 class Entity(BaseModel):
     """Entity in a graph relationship."""
     source_node: str = Field(description="The identifier of the source node")
@@ -18,7 +50,7 @@ class Entity(BaseModel):
     destination_node: str = Field(description="The identifier of the destination node")
     destination_type: str = Field(description="The type or category of the destination node")
 
-class StoreMemoryInput(BaseModel):
+class StoreMemoryInput(_ScopeFilters, BaseModel):
     """Input for storing a memory."""
     messages: Union[str, List[Dict[str, str]]] = Field(description="Content to store in memory. Can be a string or a list of message dicts with 'role' and 'content' keys")
     metadata: Optional[Dict[str, Any]] = Field(description="Additional metadata to store", default=None)
@@ -27,7 +59,7 @@ class StoreMemoryInput(BaseModel):
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
     filters: Optional[Dict[str, Any]] = Field(description="Additional filters for storage", default=None)
 
-class StoreRelationshipInput(BaseModel):
+class StoreRelationshipInput(_ScopeFilters, BaseModel):
     """Input for storing a relationship in graph memory."""
     source: str = Field(
         description="The identifier of the source node in the new relationship. This can be an existing node or a new node to be created."
@@ -48,7 +80,7 @@ class StoreRelationshipInput(BaseModel):
     agent_id: Optional[str] = Field(description="Agent ID associated with memory", default=None)
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
 
-class UpdateRelationshipInput(BaseModel):
+class UpdateRelationshipInput(_ScopeFilters, BaseModel):
     """Input for updating a relationship in graph memory."""
     source: str = Field(
         description="The identifier of the source node in the relationship to be updated. This should match an existing node in the graph."
@@ -63,15 +95,16 @@ class UpdateRelationshipInput(BaseModel):
     agent_id: Optional[str] = Field(description="Agent ID associated with memory", default=None)
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
 
-class GetRelatedEntitiesInput(BaseModel):
+class GetRelatedEntitiesInput(_ScopeFilters, BaseModel):
     """Input for finding related entities in graph memory."""
     entity: str = Field(description="Entity to find relationships for")
     relationship_type: Optional[str] = Field(description="Type of relationship to filter by", default=None)
+    limit: Optional[int] = Field(description="Maximum number of relationships to return", default=_GRAPH_RESULT_LIMIT)
     user_id: Optional[str] = Field(description="User ID associated with memory", default=None)
     agent_id: Optional[str] = Field(description="Agent ID associated with memory", default=None)
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
 
-class SemanticSearchInput(BaseModel):
+class SemanticSearchInput(_ScopeFilters, BaseModel):
     """Input for semantic search."""
     query: str = Field(description="Query to search for")
     limit: Optional[int] = Field(description="Maximum number of results to return", default=10)
@@ -79,7 +112,7 @@ class SemanticSearchInput(BaseModel):
     agent_id: Optional[str] = Field(description="Agent ID associated with memory", default=None)
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
 
-class RecallMemoryInput(BaseModel):
+class RecallMemoryInput(_ScopeFilters, BaseModel):
     """Input for recalling memories."""
     query: str = Field(description="Query to search for")
     limit: Optional[int] = Field(description="Maximum number of results to return", default=10)
@@ -88,6 +121,66 @@ class RecallMemoryInput(BaseModel):
     run_id: Optional[str] = Field(description="Run ID associated with memory", default=None)
     filters: Optional[Dict[str, Any]] = Field(description="Additional filters for recall. These narrow the search scope to memory items that were stored with specific metadata", default=None)
 
+# The mem0-backed store and recall tools need a memory scope; custom functions may
+# supply their own, so only these variants check it when arguments are parsed.
+class _ScopedStoreMemoryInput(StoreMemoryInput):
+    """StoreMemoryInput that requires at least one of user_id, agent_id or run_id."""
+
+    @model_validator(mode="after")
+    def check_scope(self):
+        return self._require_scope()
+
+class _ScopedRecallMemoryInput(RecallMemoryInput):
+    """RecallMemoryInput that requires at least one of user_id, agent_id or run_id."""
+
+    @model_validator(mode="after")
+    def check_scope(self):
+        return self._require_scope()
+
+if msgspec is not None:
+    class StoreMemoryInputStruct(msgspec.Struct, kw_only=True):
+        """msgspec mirror of StoreMemoryInput used to parse tool arguments."""
+        messages: Union[str, List[Dict[str, str]]]
+        metadata: Optional[Dict[str, Any]] = None
+        user_id: Optional[str] = None
+        agent_id: Optional[str] = None
+        run_id: Optional[str] = None
+        filters: Optional[Dict[str, Any]] = None
+
+    class RecallMemoryInputStruct(msgspec.Struct, kw_only=True):
+        """msgspec mirror of RecallMemoryInput used to parse tool arguments."""
+        query: str
+        limit: Optional[int] = 10
+        user_id: Optional[str] = None
+        agent_id: Optional[str] = None
+        run_id: Optional[str] = None
+        filters: Optional[Dict[str, Any]] = None
+
+    class _ScopedStoreMemoryInputStruct(StoreMemoryInputStruct):
+        """msgspec mirror of _ScopedStoreMemoryInput."""
+
+        def __post_init__(self):
+            _ScopeFilters._require_scope(self)
+
+    class _ScopedRecallMemoryInputStruct(RecallMemoryInputStruct):
+        """msgspec mirror of _ScopedRecallMemoryInput."""
+
+        def __post_init__(self):
+            _ScopeFilters._require_scope(self)
+else:
+    StoreMemoryInputStruct = None
+    RecallMemoryInputStruct = None
+    _ScopedStoreMemoryInputStruct = None
+    _ScopedRecallMemoryInputStruct = None
+
+class StoreMemoryBatchInput(BaseModel):
+    """Input for storing several memories in one call."""
+    items: List[_ScopedStoreMemoryInput] = Field(description="Memories to store")
+
+class RecallMemoryBatchInput(BaseModel):
+    """Input for running several memory recalls in one call."""
+    queries: List[_ScopedRecallMemoryInput] = Field(description="Recall queries to run")
+
 class StoreMemoryOutput(BaseModel):
     """Output from storing a memory."""
     # id: str = Field(description="ID of stored memory")
@@ -105,18 +198,207 @@ class RecallMemoryOutput(BaseModel):
         description="Results from graph store", default=None
     )
 
+class StoreMemoryBatchOutput(BaseModel):
+    """Output from storing several memories."""
+    results: List[StoreMemoryOutput] = Field(description="Result for each stored memory, in input order")
+
+class RecallMemoryBatchOutput(BaseModel):
+    """Output from running several memory recalls."""
+    results: List[RecallMemoryOutput] = Field(description="Result for each recall query, in input order")
+
+# Argument schemas are static; build them once at import for every tool to reuse
+for _args_model in (
+    _ScopedStoreMemoryInput,
+    StoreRelationshipInput,
+    UpdateRelationshipInput,
+    GetRelatedEntitiesInput,
+    SemanticSearchInput,
+    _ScopedRecallMemoryInput,
+    StoreMemoryBatchInput,
+    RecallMemoryBatchInput,
+):
+    model_json_schema(_args_model)
+
+class MemoryCaps(NamedTuple):
+    """Which stores a Memory instance has configured."""
+    has_vector: bool
+    has_graph: bool
+
+    @property
+    def has_hybrid(self) -> bool:
+        return self.has_vector and self.has_graph
+
+def _caps(memory: Memory) -> MemoryCaps:
+    """Read the store configuration of a Memory instance once."""
+    vector_store = getattr(memory.config, "vector_store", None)
+    graph_store = getattr(memory.config, "graph_store", None)
+    return MemoryCaps(
+        has_vector=bool(vector_store and vector_store.config),
+        has_graph=bool(graph_store and graph_store.config),
+    )
+
+# Seconds a recall/vector search result may be reused, read once at import
+_RECALL_CACHE_TTL = float(os.getenv("RECALL_CACHE_TTL", "5"))
+
+class _TTLCache:
+    """Small LRU cache whose entries expire after a fixed time-to-live.
+
+    Values are copied in and out, so callers never share a cached object.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = _RECALL_CACHE_TTL):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: "OrderedDict[tuple, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, copy.deepcopy(value))
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate_scope(self, user_id: Optional[str], agent_id: Optional[str], run_id: Optional[str]) -> None:
+        """Drop searches that a memory written under this scope could appear in.
+
+        Those are searches sharing any of its scope fields, plus unscoped ones.
+        A write without any scope drops everything.
+        """
+        scope = (user_id, agent_id, run_id)
+        if not any(scope):
+            self._data.clear()
+            return
+        stale = []
+        for key in self._data:
+            key_scope = key[1:4]
+            if not any(key_scope) or any(value and value == key_value for value, key_value in zip(scope, key_scope)):
+                stale.append(key)
+        for key in stale:
+            del self._data[key]
+
+# Every live search result cache, so stores can invalidate stale recalls
+_SEARCH_CACHES: "weakref.WeakSet[_TTLCache]" = weakref.WeakSet()
+
+def _new_search_cache() -> _TTLCache:
+    cache = _TTLCache()
+    _SEARCH_CACHES.add(cache)
+    return cache
+
+def _invalidate_search_caches(user_id: Optional[str], agent_id: Optional[str], run_id: Optional[str]) -> None:
+    for cache in list(_SEARCH_CACHES):
+        cache.invalidate_scope(user_id, agent_id, run_id)
+
+# Seconds a related-entity lookup may be reused, read once at import. Writes made
+# outside these tools (MemoryManager, mem0 directly) are only picked up on expiry.
+_ENTITY_INDEX_TTL = float(os.getenv("ENTITY_INDEX_TTL", "30"))
+
+class _EntityIndex(_TTLCache):
+    """Bounded LRU index of related-entity lookups, keyed by entity, relationship type, limit and filters.
+
+    Entries expire after a time-to-live and are dropped early by graph writes made
+    through the memory tools.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = _ENTITY_INDEX_TTL):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+
+    def invalidate_entities(self, entities: Optional[Iterable[str]]) -> None:
+        """Drop lookups for the given entities, or everything when entities is None."""
+        if entities is None:
+            self._data.clear()
+            return
+        names = {_graph_name(entity) for entity in entities}
+        for key in [key for key in self._data if _graph_name(key[0]) in names]:
+            del self._data[key]
+
+# Every live entity index, so graph writes can drop lookups they make stale
+_ENTITY_INDEXES: "weakref.WeakSet[_EntityIndex]" = weakref.WeakSet()
+
+def _new_entity_index() -> _EntityIndex:
+    index = _EntityIndex()
+    _ENTITY_INDEXES.add(index)
+    return index
+
+def _invalidate_entity_indexes(entities: Optional[Iterable[str]] = None) -> None:
+    for index in list(_ENTITY_INDEXES):
+        index.invalidate_entities(entities)
+
+def _graph_name(value: str) -> str:
+    """Normalize a node or relationship name the way mem0 stores it."""
+    return value.lower().replace(" ", "_")
+
+def _search_cache_key(args: Union["RecallMemoryInput", "SemanticSearchInput"], filters: Optional[Dict[str, Any]] = None) -> Optional[tuple]:
+    """Hashable key for a search, or None when the filters cannot be hashed."""
+    key = (
+        args.query,
+        args.user_id,
+        args.agent_id,
+        args.run_id,
+        args.limit,
+        tuple(sorted(filters.items())) if filters else None,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+def _bind_memory(method: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """Bind a memory method as an awaitable callable that does not block the event loop.
+
+    Async methods (e.g. on AsyncMemory) are used directly; synchronous ones are
+    wrapped to run in a worker thread so concurrent tool calls can overlap.
+    """
+    if inspect.iscoroutinefunction(method):
+        return method
+    return functools.partial(asyncio.to_thread, method)
+
+# Outputs below wrap data returned by mem0 and hold Any-typed fields, so they are
+# built with model_construct rather than re-validated.
+def _to_store_output(result: Any) -> StoreMemoryOutput:
+    """Wrap a memory.add result, handling both v1.1 and legacy formats."""
+    if isinstance(result, dict):
+        return StoreMemoryOutput.model_construct(
+            results=result.get("results", []),
+            relations=result.get("relations")
+        )
+    # Legacy format returns just the results
+    return StoreMemoryOutput.model_construct(results=result)
+
+def _to_recall_output(results: Any) -> RecallMemoryOutput:
+    """Wrap a memory.search result, handling both v1.1 and legacy formats."""
+    if isinstance(results, dict):
+        return RecallMemoryOutput.model_construct(
+            results=results.get("results", []),
+            relations=results.get("relations")
+        )
+    # Legacy format returns just the results list
+    return RecallMemoryOutput.model_construct(results=results)
+
 # Tool Implementations
 class StoreMemoryTool(BaseTool):
     """Tool for storing memories."""
     
     def __init__(self, memory: Memory):
         super().__init__(
-            args_type=StoreMemoryInput,
+            args_type=_ScopedStoreMemoryInput,
+            args_struct=_ScopedStoreMemoryInputStruct,
             return_type=StoreMemoryOutput,
             name="store_memory",
             description="Store information in memory for later retrieval"
         )
         self.memory = memory
+        self._add = _bind_memory(memory.add)
 
     async def run(self, args: StoreMemoryInput, cancellation_token: Optional[CancellationToken] = None) -> StoreMemoryOutput:
         """Store memory with context."""
@@ -129,37 +411,72 @@ class StoreMemoryTool(BaseTool):
         agent_id = args.agent_id
         run_id = args.run_id
 
-        if not any([user_id, agent_id, run_id]):
-            raise ValueError("At least one of user_id, agent_id, or run_id must be provided in context or args")
-
         # Store memory with context
         try:
-            result = self.memory.add(
+            result = await self._add(
                 messages=args.messages,
                 user_id=user_id,
                 agent_id=agent_id,
                 run_id=run_id,
                 metadata=context
             )
+            _invalidate_search_caches(user_id, agent_id, run_id)
+            # Extracted relations may touch any entity
+            _invalidate_entity_indexes()
             
-            # Handle both v1.1 and legacy formats
-            if isinstance(result, dict):
-                return StoreMemoryOutput(
-                    results=result.get("results", []),
-                    relations=result.get("relations")
-                )
-            else:
-                # Legacy format returns just the results
-                return StoreMemoryOutput(results=result)
+            return _to_store_output(result)
                 
         except Exception as e:
             raise ValueError(f"Failed to store memory: {str(e)}")
 
+class StoreMemoryBatchTool(BaseTool):
+    """Tool for storing several memories in one call."""
+    
+    def __init__(self, memory: Memory):
+        super().__init__(
+            args_type=StoreMemoryBatchInput,
+            return_type=StoreMemoryBatchOutput,
+            name="store_memory_batch",
+            description="Store several pieces of information in memory at once"
+        )
+        self.memory = memory
+        self._add = _bind_memory(memory.add)
+        batch_add = getattr(memory, "batch_add", None)
+        self._batch_add = _bind_memory(batch_add) if batch_add is not None else None
+
+    async def run(self, args: StoreMemoryBatchInput, cancellation_token: Optional[CancellationToken] = None) -> StoreMemoryBatchOutput:
+        """Store all memories, using the store's batch API when it has one."""
+        batch_data = [
+            {
+                "messages": item.messages,
+                "user_id": item.user_id,
+                "agent_id": item.agent_id,
+                "run_id": item.run_id,
+                "metadata": dict(item.metadata) if item.metadata else {},
+            }
+            for item in args.items
+        ]
+
+        try:
+            if self._batch_add is not None:
+                results = await self._batch_add(batch_data)
+            else:
+                # No batch API: add one at a time, since mem0's add deduplicates against
+                # existing memories and concurrent adds could both store the same fact
+                results = [await self._add(**data) for data in batch_data]
+            for scope in {(data["user_id"], data["agent_id"], data["run_id"]) for data in batch_data}:
+                _invalidate_search_caches(*scope)
+            _invalidate_entity_indexes()
+            return StoreMemoryBatchOutput.model_construct(results=[_to_store_output(result) for result in results])
+
+        except Exception as e:
+            raise ValueError(f"Failed to store memories: {str(e)}")
+
 class StoreRelationshipTool(BaseTool):
     """Tool for storing relationships in graph memory."""
 
-    def __init__(self, memory: Memory):
-        if not memory.config.graph_store and not memory.config.graph_store.config:
+    def __init__(self, memory: Memory, caps: Optional[MemoryCaps] = None):
+        if not (caps or _caps(memory)).has_graph:
             raise ValueError("Graph store is not enabled")
             
         super().__init__(
@@ -172,13 +489,7 @@ class StoreRelationshipTool(BaseTool):
 
     async def run(self, args: StoreRelationshipInput, cancellation_token: Optional[CancellationToken] = None) -> StoreMemoryOutput:
         """Store a relationship."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
+        filters = args.to_filters()
 
         result = await self.memory.graph.add({
             "source": args.source,
@@ -187,13 +498,16 @@ class StoreRelationshipTool(BaseTool):
             "destination": args.destination,
             "destination_type": args.destination_type
         }, filters=filters)
-        return StoreMemoryOutput(**result)
+        # Recalls include graph relations, so they go stale too
+        _invalidate_search_caches(args.user_id, args.agent_id, args.run_id)
+        _invalidate_entity_indexes((args.source, args.destination))
+        return StoreMemoryOutput.model_construct(**result)
 
 class UpdateRelationshipTool(BaseTool):
     """Tool for updating relationships in graph memory."""
 
-    def __init__(self, memory: Memory):
-        if not memory.config.graph_store and not memory.config.graph_store.config:
+    def __init__(self, memory: Memory, caps: Optional[MemoryCaps] = None):
+        if not (caps or _caps(memory)).has_graph:
             raise ValueError("Graph store is not enabled")
             
         super().__init__(
@@ -206,57 +520,22 @@ class UpdateRelationshipTool(BaseTool):
 
     async def run(self, args: UpdateRelationshipInput, cancellation_token: Optional[CancellationToken] = None) -> StoreMemoryOutput:
         """Update a relationship."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
+        filters = args.to_filters()
 
         result = await self.memory.graph.update({
             "source": args.source,
             "destination": args.destination,
             "relationship": args.relationship
         }, filters=filters)
-        return StoreMemoryOutput(**result)
-
-class GetRelatedEntitiesTool(BaseTool):
-    """Tool for finding related entities in graph memory."""
-
-    def __init__(self, memory: Memory):
-        if not memory.config.graph_store and not memory.config.graph_store.config:
-            raise ValueError("Graph store is not enabled")
-            
-        super().__init__(
-            args_type=GetRelatedEntitiesInput,
-            return_type=List[Dict[str, Any]],
-            name="get_related_entities",
-            description="Search for nodes and relations in the graph."
-        )
-        self.memory = memory
-
-    async def run(self, args: GetRelatedEntitiesInput, cancellation_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
-        """Get related entities."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
-
-        return await self.memory.get_related_entities(
-            entity=args.entity,
-            relationship_type=args.relationship_type,
-            **filters
-        )
+        _invalidate_search_caches(args.user_id, args.agent_id, args.run_id)
+        _invalidate_entity_indexes((args.source, args.destination))
+        return StoreMemoryOutput.model_construct(**result)
 
 class SemanticSearchTool(BaseTool):
     """Tool for semantic search in vector memory."""
 
-    def __init__(self, memory: Memory):
-        if not memory.config.vector_store and not memory.config.vector_store.config:
+    def __init__(self, memory: Memory, caps: Optional[MemoryCaps] = None):
+        if not (caps or _caps(memory)).has_vector:
             raise ValueError("Vector store is not configured")
             
         super().__init__(
@@ -269,13 +548,7 @@ class SemanticSearchTool(BaseTool):
 
     async def run(self, args: SemanticSearchInput, cancellation_token: Optional[CancellationToken] = None) -> Dict[str, Any]:
         """Search for memories."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
+        filters = args.to_filters()
 
         return await self.memory.recall(
             query=args.query,
@@ -289,25 +562,31 @@ class RecallMemoryTool(BaseTool):
     
     def __init__(self, memory: Memory):
         super().__init__(
-            args_type=RecallMemoryInput,
+            args_type=_ScopedRecallMemoryInput,
+            args_struct=_ScopedRecallMemoryInputStruct,
             return_type=RecallMemoryOutput,
             name="recall_memory",
             description="Recall previously stored information from memory. Note: Context will be automatically provided from the client."
         )
         self.memory = memory
+        self._search = _bind_memory(memory.search)
+        self._cache = _new_search_cache()
 
     async def run(self, args: RecallMemoryInput, cancellation_token: Optional[CancellationToken] = None) -> RecallMemoryOutput:
         """Recall memories with context."""
         user_id = args.user_id
         agent_id = args.agent_id
         run_id = args.run_id
-        
-        if not any([user_id, agent_id, run_id]):
-            raise ValueError("At least one of user_id, agent_id, or run_id must be provided")
+
+        cache_key = _search_cache_key(args, args.filters)
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
             
         try:
             # Search with top-level parameters and optional metadata filters
-            results = self.memory.search(
+            results = await self._search(
                 query=args.query,
                 user_id=user_id,
                 agent_id=agent_id,
@@ -316,19 +595,46 @@ class RecallMemoryTool(BaseTool):
                 filters=args.filters  # Optional metadata filters like {"topic": "geography"}
             )
             
-            # Handle both v1.1 and legacy formats
-            if isinstance(results, dict):
-                return RecallMemoryOutput(
-                    results=results.get("results", []),
-                    relations=results.get("relations")
-                )
-            else:
-                # Legacy format returns just the results list
-                return RecallMemoryOutput(results=results)
+            output = _to_recall_output(results)
+            if cache_key is not None:
+                self._cache.set(cache_key, output)
+            return output
                 
         except Exception as e:
             raise ValueError(f"Failed to recall memories: {str(e)}")
 
+class RecallMemoryBatchTool(BaseTool):
+    """Tool for running several memory recalls in one call."""
+    
+    def __init__(self, memory: Memory):
+        super().__init__(
+            args_type=RecallMemoryBatchInput,
+            return_type=RecallMemoryBatchOutput,
+            name="recall_memory_batch",
+            description="Recall previously stored information for several queries at once"
+        )
+        self.memory = memory
+        self._search = _bind_memory(memory.search)
+
+    async def run(self, args: RecallMemoryBatchInput, cancellation_token: Optional[CancellationToken] = None) -> RecallMemoryBatchOutput:
+        """Run all recalls concurrently."""
+        try:
+            results = await asyncio.gather(*(
+                self._search(
+                    query=query.query,
+                    user_id=query.user_id,
+                    agent_id=query.agent_id,
+                    run_id=query.run_id,
+                    limit=query.limit or 10,
+                    filters=query.filters,
+                )
+                for query in args.queries
+            ))
+            return RecallMemoryBatchOutput.model_construct(results=[_to_recall_output(result) for result in results])
+
+        except Exception as e:
+            raise ValueError(f"Failed to recall memories: {str(e)}")
+
 class FunctionBasedStoreTool(BaseTool):
     """Tool for storing memories using a custom store function."""
 
@@ -338,6 +644,7 @@ class FunctionBasedStoreTool(BaseTool):
         ):
         super().__init__(
             args_type=StoreMemoryInput,
+            args_struct=StoreMemoryInputStruct,
             return_type=StoreMemoryOutput,
             name="custom_store_memory",
             description="Store information in memory using custom store function"
@@ -346,26 +653,33 @@ class FunctionBasedStoreTool(BaseTool):
 
     async def run(self, args: StoreMemoryInput, cancellation_token: Optional[CancellationToken] = None) -> StoreMemoryOutput:
         """Store a memory using the custom store function."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
+        filters = args.to_filters()
         if args.filters:
             filters.update(args.filters)
 
         result = await self.store_fn(
             content=args.messages,
-            store_type=args.store_type or "all",
+            store_type="all",
             metadata=args.metadata,
             **filters
         )
-        return StoreMemoryOutput(**result)
+        return StoreMemoryOutput.model_construct(**result)
+
+def _matches_filters(item: Any, filters: Dict[str, Any]) -> bool:
+    """Whether a recalled item carries every filter value, at top level or in its metadata."""
+    if not isinstance(item, dict):
+        return False
+    metadata = item.get("metadata") or {}
+    return all(item.get(key, metadata.get(key)) == value for key, value in filters.items())
 
 class FunctionBasedRecallTool(BaseTool):
-    """Tool for recalling memories using a custom recall function."""
+    """Tool for recalling memories using a custom recall function.
+
+    A recall_fn may declare which filter keys its backend can index with an
+    ``__indexed_filters__`` set. Only those keys are passed to it; the rest are
+    applied to the returned results. Functions without the attribute, or with
+    it set to None, receive every filter and are trusted to apply them.
+    """
 
     def __init__(
             self,
@@ -373,136 +687,215 @@ class FunctionBasedRecallTool(BaseTool):
         ):
         super().__init__(
             args_type=RecallMemoryInput,
+            args_struct=RecallMemoryInputStruct,
             return_type=RecallMemoryOutput,
             name="custom_recall_memory",
             description="Recall information from memory using custom recall function"
         )
         self.recall_fn = recall_fn
+        indexed = getattr(recall_fn, "__indexed_filters__", None)
+        self._indexed_filters = frozenset(indexed) if indexed is not None else None
 
     async def run(self, args: RecallMemoryInput, cancellation_token: Optional[CancellationToken] = None) -> RecallMemoryOutput:
         """Recall memories using the custom recall function."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
+        filters = args.to_filters()
         if args.filters:
             filters.update(args.filters)
 
+        post_filters: Dict[str, Any] = {}
+        if self._indexed_filters is not None:
+            post_filters = {key: value for key, value in filters.items() if key not in self._indexed_filters}
+            filters = {key: value for key, value in filters.items() if key in self._indexed_filters}
+
         result = await self.recall_fn(
             query=args.query,
-            store_type=args.store_type or "all",
+            store_type="all",
             limit=args.limit or 100,
             **filters
         )
+        if post_filters and isinstance(result.get("results"), list):
+            result = {**result, "results": list(filter(
+                functools.partial(_matches_filters, filters=post_filters), result["results"]
+            ))}
         return RecallMemoryOutput(**result)
 
-class GraphSearchTool(BaseTool):
-    """Tool for searching entities in graph memory."""
-
-    def __init__(self, memory: Memory):
-        if not memory.config.graph_store and not memory.config.graph_store.config:
-            raise ValueError("Graph store is not enabled")
-            
-        super().__init__(
-            args_type=GetRelatedEntitiesInput,
-            return_type=List[Dict[str, Any]],
-            name="graph_search",
-            description="Search for nodes and relations in the graph store."
-        )
-        self.memory = memory
-
-    async def run(self, args: GetRelatedEntitiesInput, cancellation_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
-        """Search graph store."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
-
-        return await self.memory.get_related_entities(
-            entity=args.entity,
-            relationship_type=args.relationship_type,
-            store_type="graph",  # Explicitly use graph store
-            **filters
-        )
-
-class VectorSearchTool(BaseTool):
-    """Tool for semantic search in vector memory."""
-
-    def __init__(self, memory: Memory):
-        if not memory.config.vector_store and not memory.config.vector_store.config:
-            raise ValueError("Vector store is not enabled")
-            
-        super().__init__(
-            args_type=SemanticSearchInput,  # Reuse existing input model
-            return_type=List[Dict[str, Any]],
-            name="vector_search",
-            description="Perform semantic search in the vector store."
+class _DispatchTool(BaseTool):
+    """Memory tool whose run delegates to a dispatch function built for its Memory."""
+
+    async def run(self, args: BaseModel, cancellation_token: Optional[CancellationToken] = None) -> Any:
+        return await self._dispatch(args)
+
+def _make_tool(
+    class_name: str,
+    doc: str,
+    *,
+    name: str,
+    description: str,
+    args_type: type[BaseModel],
+    return_type: Any,
+    requires: Callable[[MemoryCaps], bool],
+    missing_error: str,
+    dispatch_builder: Callable[[Memory], Callable[[Any], Awaitable[Any]]],
+) -> type[_DispatchTool]:
+    """Create a memory tool class that checks store capabilities and dispatches to memory."""
+
+    def __init__(self, memory: Memory, caps: Optional[MemoryCaps] = None):
+        if not requires(caps or _caps(memory)):
+            raise ValueError(missing_error)
+
+        _DispatchTool.__init__(
+            self,
+            args_type=args_type,
+            return_type=return_type,
+            name=name,
+            description=description
         )
         self.memory = memory
-
-    async def run(self, args: SemanticSearchInput, cancellation_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
-        """Search vector store."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
-
-        results = await self.memory.search(
+        self._dispatch = dispatch_builder(memory)
+
+    return type(class_name, (_DispatchTool,), {
+        "__init__": __init__,
+        "__doc__": doc,
+        "__module__": __name__,
+        "__qualname__": class_name,
+    })
+
+# Relationship type and user are matched inside the traversal, on both ends of
+# the edge, so the graph backend only returns qualifying edges instead of every
+# neighbour, and never edges from another user. mem0 writes graph nodes with only
+# a name and user_id, so agent_id and run_id cannot narrow the lookup.
+_RELATED_ENTITIES_CYPHER = """
+MATCH (n {name: $entity})-[r]-(m)
+WHERE ($relationship_type IS NULL OR type(r) = $relationship_type)
+  AND ($user_id IS NULL OR (n.user_id = $user_id AND m.user_id = $user_id))
+RETURN startNode(r).name AS source, type(r) AS relationship, endNode(r).name AS destination
+LIMIT $limit
+"""
+
+def _related_entities_dispatch(store_type: Optional[str] = None) -> Callable[[Memory], Callable[[GetRelatedEntitiesInput], Awaitable[Any]]]:
+    def build(memory: Memory) -> Callable[[GetRelatedEntitiesInput], Awaitable[Any]]:
+        if hasattr(memory, "get_related_entities"):
+            get_related_entities = _bind_memory(memory.get_related_entities)
+            store_args = {"store_type": store_type} if store_type else {}
+
+            async def fetch(args: GetRelatedEntitiesInput, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+                return await get_related_entities(
+                    entity=args.entity,
+                    relationship_type=args.relationship_type,
+                    **store_args,
+                    **filters
+                )
+        else:
+            # mem0's Memory has no related-entity lookup; query its graph backend directly
+            graph_query = _bind_memory(memory.graph.graph.query)
+
+            async def fetch(args: GetRelatedEntitiesInput, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+                return await graph_query(_RELATED_ENTITIES_CYPHER, params={
+                    "entity": _graph_name(args.entity),
+                    "relationship_type": _graph_name(args.relationship_type) if args.relationship_type else None,
+                    "user_id": args.user_id,
+                    "limit": args.limit or _GRAPH_RESULT_LIMIT,
+                })
+
+        index = _new_entity_index()
+
+        async def dispatch(args: GetRelatedEntitiesInput) -> List[Dict[str, Any]]:
+            filters = args.to_filters()
+            key = (args.entity, args.relationship_type, args.limit, tuple(sorted(filters.items())))
+            cached = index.get(key)
+            if cached is not None:
+                return cached
+
+            results = await fetch(args, filters)
+            index.set(key, results)
+            return results
+        return dispatch
+    return build
+
+def _vector_search_dispatch(memory: Memory) -> Callable[[SemanticSearchInput], Awaitable[Any]]:
+    search = _bind_memory(memory.search)
+    cache = _new_search_cache()
+
+    async def dispatch(args: SemanticSearchInput) -> List[Dict[str, Any]]:
+        cache_key = _search_cache_key(args)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        results = await search(
             query=args.query,
             limit=args.limit,
             store_type="vector",  # Explicitly use vector store
-            **filters
+            **args.to_filters()
         )
-        return results.get("vector", [])
+        vector_results = results.get("vector", [])
+        cache.set(cache_key, vector_results)
+        return vector_results
+    return dispatch
 
-class HybridSearchTool(BaseTool):
-    """Tool for hybrid search across both vector and graph stores."""
+def _hybrid_search_dispatch(memory: Memory) -> Callable[[SemanticSearchInput], Awaitable[Any]]:
+    search = _bind_memory(memory.search)
 
-    def __init__(self, memory: Memory):
-        if not (memory.config.vector_store and memory.config.graph_store):
-            raise ValueError("Both vector and graph stores must be enabled for hybrid search")
-            
-        super().__init__(
-            args_type=SemanticSearchInput,  # Reuse semantic search input
-            return_type=List[Dict[str, Any]],
-            name="hybrid_search",
-            description="Perform hybrid search across both vector and graph stores."
-        )
-        self.memory = memory
+    async def dispatch(args: SemanticSearchInput) -> List[Dict[str, Any]]:
+        filters = args.to_filters()
 
-    async def run(self, args: SemanticSearchInput, cancellation_token: Optional[CancellationToken] = None) -> List[Dict[str, Any]]:
-        """Perform hybrid search."""
-        filters = {}
-        if args.user_id:
-            filters["user_id"] = args.user_id
-        if args.agent_id:
-            filters["agent_id"] = args.agent_id
-        if args.run_id:
-            filters["run_id"] = args.run_id
-
-        results = await self.memory.search(
-            query=args.query,
-            limit=args.limit,
-            store_type="all",  # Use both stores
-            **filters
+        # The stores are independent, so query them concurrently
+        vector_results, graph_results = await asyncio.gather(
+            search(query=args.query, limit=args.limit, store_type="vector", **filters),
+            search(query=args.query, limit=args.limit, store_type="graph", **filters),
         )
-        # Combine and deduplicate results
-        all_results = []
-        if "vector" in results:
-            all_results.extend(results["vector"])
-        if "graph" in results:
-            all_results.extend(results["graph"])
+        # Combine results in a single allocation
         # Could add result ranking/scoring here
-        return all_results
+        return [*vector_results.get("vector", ()), *graph_results.get("graph", ())]
+    return dispatch
+
+GetRelatedEntitiesTool = _make_tool(
+    "GetRelatedEntitiesTool",
+    "Tool for finding related entities in graph memory.",
+    name="get_related_entities",
+    description="Search for nodes and relations in the graph.",
+    args_type=GetRelatedEntitiesInput,
+    return_type=List[Dict[str, Any]],
+    requires=lambda caps: caps.has_graph,
+    missing_error="Graph store is not enabled",
+    dispatch_builder=_related_entities_dispatch(),
+)
+
+GraphSearchTool = _make_tool(
+    "GraphSearchTool",
+    "Tool for searching entities in graph memory.",
+    name="graph_search",
+    description="Search for nodes and relations in the graph store.",
+    args_type=GetRelatedEntitiesInput,
+    return_type=List[Dict[str, Any]],
+    requires=lambda caps: caps.has_graph,
+    missing_error="Graph store is not enabled",
+    dispatch_builder=_related_entities_dispatch("graph"),  # Explicitly use graph store
+)
+
+VectorSearchTool = _make_tool(
+    "VectorSearchTool",
+    "Tool for semantic search in vector memory.",
+    name="vector_search",
+    description="Perform semantic search in the vector store.",
+    args_type=SemanticSearchInput,  # Reuse existing input model
+    return_type=List[Dict[str, Any]],
+    requires=lambda caps: caps.has_vector,
+    missing_error="Vector store is not enabled",
+    dispatch_builder=_vector_search_dispatch,
+)
+
+HybridSearchTool = _make_tool(
+    "HybridSearchTool",
+    "Tool for hybrid search across both vector and graph stores.",
+    name="hybrid_search",
+    description="Perform hybrid search across both vector and graph stores.",
+    args_type=SemanticSearchInput,  # Reuse semantic search input
+    return_type=List[Dict[str, Any]],
+    requires=lambda caps: caps.has_hybrid,
+    missing_error="Both vector and graph stores must be enabled for hybrid search",
+    dispatch_builder=_hybrid_search_dispatch,
+)
 
 def create_memory_tools(
     store_fn: Callable[[str, str, Optional[Dict[str, Any]], ...], Awaitable[Dict[str, Any]]],
@@ -564,29 +957,50 @@ def create_memory_tools(
         FunctionBasedRecallTool(recall_fn)
     ]
 
+# Attribute holding the tools built for a Memory instance. The tools reference the
+# Memory, so they live on it rather than in a module-level map that would keep it alive.
+# They carry no per-agent state, so agents sharing a Memory share them.
+_TOOLS_ATTR = "_autogen_mem0_tools"
+
 def get_memory_tools(memory: Memory) -> List[BaseTool]:
-    """Get all available memory tools based on configuration."""
+    """Get all available memory tools based on configuration.
+
+    Tools are built once per Memory instance and reused on later calls; each
+    call returns a new list so callers can extend it freely. The batch tools are
+    not included; construct StoreMemoryBatchTool or RecallMemoryBatchTool directly
+    to offer them.
+    """
+    cached = getattr(memory, _TOOLS_ATTR, None)
+    if cached is not None:
+        return list(cached)
+
+    caps = _caps(memory)
     tools = [
         StoreMemoryTool(memory),
         RecallMemoryTool(memory)
     ]
 
     # Check if graph store is actually configured
-    if memory.config.graph_store and memory.config.graph_store.config:
+    if caps.has_graph:
         tools.extend([
-            StoreRelationshipTool(memory),
-            UpdateRelationshipTool(memory),
-            GetRelatedEntitiesTool(memory),
-            GraphSearchTool(memory)
+            StoreRelationshipTool(memory, caps),
+            UpdateRelationshipTool(memory, caps),
+            GetRelatedEntitiesTool(memory, caps),
+            GraphSearchTool(memory, caps)
         ])
 
     # Check if vector store is actually configured
-    if memory.config.vector_store and memory.config.vector_store.config:
-        tools.append(SemanticSearchTool(memory))
-        tools.append(VectorSearchTool(memory))
+    if caps.has_vector:
+        tools.append(SemanticSearchTool(memory, caps))
+        tools.append(VectorSearchTool(memory, caps))
 
     # Check if both vector and graph stores are configured
-    if memory.config.vector_store and memory.config.graph_store and memory.config.vector_store.config and memory.config.graph_store.config:
-        tools.append(HybridSearchTool(memory))
-
-    return tools
\ No newline at end of file
+    if caps.has_hybrid:
+        tools.append(HybridSearchTool(memory, caps))
+
+    try:
+        setattr(memory, _TOOLS_ATTR, tuple(tools))
+    except AttributeError:
+        # Memory types with __slots__ cannot hold the cache; build tools per call
+        pass
+    return tools
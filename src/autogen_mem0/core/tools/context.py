@@ -1,7 +1,7 @@
 """Context management tools."""
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
 
 from autogen_core.base import CancellationToken
 from autogen_mem0.core.tools._base import BaseTool
@@ -20,24 +20,31 @@ class EntityContext(BaseModel):
     )
 
 class ConversationContext(BaseModel):
-    """Current context of the conversation."""
+    """Current context of the conversation.
+
+    Fields cannot be reassigned once built, and every default is None, so
+    construction never copies a mutable default. The context mappings are
+    typed read-only but hold the dicts they were given; do not mutate them.
+    """
+    model_config = ConfigDict(frozen=True)
+
     primary_subject: Optional[EntityContext] = Field(
         description="The main entity being discussed",
         default=None
     )
-    related_entities: Optional[List[EntityContext]] = Field(
+    related_entities: Optional[Tuple[EntityContext, ...]] = Field(
         description="Other entities mentioned in relation to the primary subject",
         default=None
     )
-    temporal_context: Optional[Dict[str, Any]] = Field(
+    temporal_context: Optional[Mapping[str, Any]] = Field(
         description="Time-related context (past events, future plans, etc)",
         default=None
     )
-    spatial_context: Optional[Dict[str, Any]] = Field(
+    spatial_context: Optional[Mapping[str, Any]] = Field(
         description="Location or space-related context",
         default=None
     )
-    topic_context: Optional[Dict[str, Any]] = Field(
+    topic_context: Optional[Mapping[str, Any]] = Field(
         description="Subject matter or topic being discussed",
         default=None
     )
@@ -1,8 +1,13 @@
 """Anthropic chat completion client."""
 
-from typing import Any, Dict, List, Optional, AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, AsyncGenerator
+import asyncio
+import inspect
+import io
 import os
-import json
+import sys
+import orjson
 from anthropic import AsyncAnthropic
 
 from autogen_core.base import CancellationToken
@@ -25,6 +30,94 @@ from ._model_info import (
 import logging
 logger = logging.getLogger(__name__)
 
+# API key from the environment, read once at import time
+_DEFAULT_API_KEY: Optional[str] = os.getenv("ANTHROPIC_API_KEY")
+
+
+def refresh_default_api_key() -> Optional[str]:
+    """Re-read ANTHROPIC_API_KEY from the environment, e.g. after it is patched in tests."""
+    global _DEFAULT_API_KEY
+    _DEFAULT_API_KEY = os.getenv("ANTHROPIC_API_KEY")
+    return _DEFAULT_API_KEY
+
+# Streaming event types, interned so dispatch lookups hit the identity fast path
+_T_MESSAGE_START = sys.intern("message_start")
+_T_CONTENT_BLOCK_START = sys.intern("content_block_start")
+_T_CONTENT_BLOCK_DELTA = sys.intern("content_block_delta")
+_T_MESSAGE_DELTA = sys.intern("message_delta")
+
+
+@dataclass(slots=True)
+class _StreamState:
+    """Accumulated state for a single streamed message."""
+    message_data: Any = None
+    text: io.StringIO = field(default_factory=io.StringIO)
+    tool_blocks: List[Any] = field(default_factory=list)
+
+
+def _on_message_start(event: Any, state: _StreamState) -> None:
+    state.message_data = event
+
+
+def _on_content_block_start(event: Any, state: _StreamState) -> None:
+    if event.content_block.type == "tool_use":
+        # Accumulate tool use blocks, converted once the message completes
+        state.tool_blocks.append(event.content_block)
+
+
+def _on_content_block_delta(event: Any, state: _StreamState) -> None:
+    if event.delta.type == "text_delta":
+        state.text.write(event.delta.text)
+
+
+def _on_message_delta(event: Any, state: _StreamState) -> Optional[CreateResult]:
+    message_data = state.message_data
+    if not (message_data and message_data.usage):
+        return None
+
+    # Final message with usage stats
+    usage = RequestUsage(
+        prompt_tokens=message_data.usage.input_tokens,
+        completion_tokens=message_data.usage.output_tokens
+    )
+
+    # Return tool calls or text, not both
+    if state.tool_blocks:
+        result = CreateResult(
+            content=[
+                FunctionCall(
+                    id=block.id,
+                    arguments=orjson.dumps(block.input).decode(),
+                    name=block.name,
+                )
+                for block in state.tool_blocks
+            ],
+            usage=usage,
+            finish_reason="tool_calls",
+            cached=False
+        )
+    else:
+        result = CreateResult(
+            content=state.text.getvalue(),
+            usage=usage,
+            finish_reason="stop",
+            cached=False
+        )
+
+    # Reset accumulators
+    state.message_data = None
+    state.text = io.StringIO()
+    state.tool_blocks = []
+    return result
+
+
+_STREAM_HANDLERS: Dict[str, Callable[[Any, _StreamState], Optional[CreateResult]]] = {
+    _T_MESSAGE_START: _on_message_start,
+    _T_CONTENT_BLOCK_START: _on_content_block_start,
+    _T_CONTENT_BLOCK_DELTA: _on_content_block_delta,
+    _T_MESSAGE_DELTA: _on_message_delta,
+}
+
 class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
     """Chat completion client for Anthropic's Claude models."""
 
@@ -36,7 +129,7 @@ class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
             raise ValueError("model is required for AnthropicChatCompletionClient")
 
         # Get API key
-        api_key = kwargs.get("api_key") or os.getenv("ANTHROPIC_API_KEY")
+        api_key = kwargs.get("api_key") or _DEFAULT_API_KEY or refresh_default_api_key()
         if not api_key:
             raise ValueError("No API key provided")
 
@@ -64,8 +157,70 @@ class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
         self._last_request_cost = 0.0
         self._total_cost = 0.0
 
+        # Cache of the last converted tool list, keyed by tool identity. The tools
+        # themselves are kept alive so their ids cannot be reused.
+        self._cached_tools: tuple = ()
+        self._cached_tools_key: Optional[tuple] = None
+        self._cached_anthropic_tools: Optional[List[Any]] = None
+
         logger.info("[AnthropicClient:__init__] Client initialization complete")
 
+    def _adapt_tools(self, tools: List[Tool]) -> List[Any]:
+        """Convert tools to Anthropic format, reusing the previous result for the same tools."""
+        key = tuple(id(tool) for tool in tools)
+        if key != self._cached_tools_key:
+            self._cached_anthropic_tools = ToolAdapterFactory.adapt_tools(tools, "anthropic")
+            self._cached_tools = tuple(tools)
+            self._cached_tools_key = key
+        return self._cached_anthropic_tools
+
+    def _prepare_create_args(
+        self,
+        messages: List[LLMMessage],
+        tools: Optional[List[Tool]] = None,
+        stream: bool = False,
+    ) -> Dict[str, Any]:
+        """Build the request arguments shared by create and create_stream."""
+        create_args: Dict[str, Any] = {
+            "model": self._model,
+            "max_tokens": self._max_tokens,
+        }
+        if stream:
+            create_args["stream"] = True
+
+        # Extract system message
+        system_message = None
+        for message in messages:
+            if isinstance(message, SystemMessage):
+                if system_message is not None:
+                    raise ValueError("Multiple system messages not supported")
+                system_message = message
+                create_args["system"] = message.content
+
+        # Convert messages
+        create_args["messages"] = MessageAdapterFactory.adapt(
+            messages,
+            "autogen_core.components.models.LLMMessage",
+            "anthropic.types.beta.BetaMessage"
+        )
+
+        # Convert tools
+        if tools:
+            try:
+                create_args["tools"] = self._adapt_tools(tools)
+                create_args["tool_choice"] = {"type": "auto"}
+            except Exception as e:
+                logger.error("[AnthropicClient:_prepare_create_args] Error converting tools: %s", str(e))
+                raise AnthropicError(f"Failed to convert tools: {str(e)}") from e
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[AnthropicClient:_prepare_create_args] Raw request parameters: %s",
+                orjson.dumps(create_args, option=orjson.OPT_INDENT_2).decode()
+            )
+
+        return create_args
+
     async def create(
         self,
         messages: List[LLMMessage],
@@ -74,53 +229,14 @@ class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
     ) -> CreateResult:
         """Create a chat completion."""
         try:
-            # Prepared request
-            create_args = {
-                "model": self._model,
-                "max_tokens": self._max_tokens,
-            }
-
-            # Extract system message and convert other messages
-            system_message = None
-            for message in messages:
-                if isinstance(message, SystemMessage):
-                    if system_message is None:
-                        create_args["system"] = message.content
-                    else:
-                        raise ValueError("Multiple system messages not supported")
-
-            # Convert messages
-            anthropic_messages = MessageAdapterFactory.adapt(
-                messages, 
-                "autogen_core.components.models.LLMMessage", 
-                "anthropic.types.beta.BetaMessage"
-            )
-
-            create_args["messages"] = anthropic_messages
-            logger.info(f"{anthropic_messages=}")
-
-            # Convert tools
-            if tools:
-                try: 
-                    anthropic_tools = ToolAdapterFactory.adapt_tools(tools, "anthropic")
-                    create_args["tools"] = anthropic_tools
-                    create_args["tool_choice"] = {"type": "auto"}
-                except Exception as e:
-                    logger.error("[AnthropicClient:create] Error converting tools: %s", str(e))
-                    raise AnthropicError(f"Failed to convert tools: {str(e)}") from e
-
-            all_args = {
-                **create_args
-            }
-
-            logger.debug("[AnthropicClient:create] Raw request parameters: %s", json.dumps(all_args, indent=2))
+            create_args = self._prepare_create_args(messages, tools)
 
             # Make API call
             if self._prompt_caching:
                 logger.debug("[AnthropicClient:create] Prompt caching enabled, using prompt_caching completion")
-                future = self._client.beta.prompt_caching.messages.create(**all_args)
+                future = self._client.beta.prompt_caching.messages.create(**create_args)
             else:
-                future = self._client.beta.messages.create(**all_args)
+                future = self._client.beta.messages.create(**create_args)
 
             if cancellation_token:
                 cancellation_token.link_future(future)
@@ -157,42 +273,7 @@ class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
     ) -> AsyncGenerator[CreateResult, None]:
         """Create a streaming chat completion."""
         try:
-            # Prepare base request
-            create_args = {
-                "model": self._model,
-                "max_tokens": self._max_tokens,
-                "stream": True,
-            }
-
-            # Extract system message and convert other messages
-            system_message = None
-            for message in messages:
-                if isinstance(message, SystemMessage):
-                    if system_message is None:
-                        create_args["system"] = message.content
-                    else:
-                        raise ValueError("Multiple system messages not supported")
-
-            # Convert messages
-            anthropic_messages = MessageAdapterFactory.adapt(
-                messages,
-                "autogen_core.components.models.LLMMessage",
-                "anthropic.types.beta.BetaMessage"
-            )
-            create_args["messages"] = anthropic_messages
-
-            # Convert tools
-            if tools:
-                try:
-                    anthropic_tools = ToolAdapterFactory.adapt_tools(tools, "anthropic")
-                    create_args["tools"] = anthropic_tools
-                    create_args["tool_choice"] = {"type": "auto"}
-                except Exception as e:
-                    logger.error("[AnthropicClient:create_stream] Error converting tools: %s", str(e))
-                    raise AnthropicError(f"Failed to convert tools: {str(e)}") from e
-
-            logger.debug("[AnthropicClient:create_stream] Raw request parameters: %s", 
-                        json.dumps(create_args, indent=2))
+            create_args = self._prepare_create_args(messages, tools, stream=True)
 
             # Make streaming API call
             if self._prompt_caching:
@@ -200,58 +281,30 @@ class AnthropicChatCompletionClient(BaseAnthropicChatCompletionClient):
             else:
                 stream = self._client.beta.messages.create(**create_args)
 
-            if cancellation_token:
-                cancellation_token.link_future(stream)
+            # The async client returns a coroutine that resolves to the event stream;
+            # run it as a task so cancellation can interrupt the request itself
+            if inspect.isawaitable(stream):
+                request = asyncio.ensure_future(stream)
+                if cancellation_token is not None:
+                    cancellation_token.link_future(request)
+                stream = await request
+
+            if cancellation_token is not None:
+                # Streams are not futures; close the underlying response on cancel instead
+                loop = asyncio.get_running_loop()
+                cancellation_token.add_callback(
+                    lambda: loop.call_soon_threadsafe(lambda: loop.create_task(stream.close()))
+                )
 
             logger.debug("[AnthropicClient:create_stream] Got stream response")
-            message_data = None
-            current_text = []
-            current_tool_calls = []
+            state = _StreamState()
 
             async for event in stream:
-                if event.type == "message_start":
-                    message_data = event
-                elif event.type == "content_block_start":
-                    if event.content_block.type == "tool_use":
-                        # Accumulate tool calls
-                        current_tool_calls.append(FunctionCall(
-                            id=event.content_block.id,
-                            name=event.content_block.name,
-                            arguments=json.dumps(event.content_block.input)
-                        ))
-                elif event.type == "content_block_delta":
-                    if event.delta.type == "text_delta":
-                        # Accumulate text
-                        current_text.append(event.delta.text)
-                elif event.type == "message_delta":
-                    # Message complete
-                    if message_data and message_data.usage:
-                        # Final message with usage stats
-                        usage = RequestUsage(
-                            prompt_tokens=message_data.usage.input_tokens,
-                            completion_tokens=message_data.usage.output_tokens
-                        )
-
-                        # Return tool calls or text, not both
-                        if current_tool_calls:
-                            yield CreateResult(
-                                content=current_tool_calls,
-                                usage=usage,
-                                finish_reason="tool_calls",
-                                cached=False
-                            )
-                        else:
-                            yield CreateResult(
-                                content="".join(current_text),
-                                usage=usage,
-                                finish_reason="stop",
-                                cached=False
-                            )
-
-                        # Reset accumulators
-                        current_text = []
-                        current_tool_calls = []
-                        message_data = None
+                handler = _STREAM_HANDLERS.get(event.type)
+                if handler is not None:
+                    result = handler(event, state)
+                    if result is not None:
+                        yield result
 
         except Exception as e:
             logger.error("[AnthropicClient:create_stream] Error during streaming: %s", str(e))
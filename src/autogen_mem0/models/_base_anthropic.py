@@ -1,6 +1,8 @@
 """Base implementation for Anthropic chat completion clients."""
 
+import functools
 import os
+from types import MappingProxyType
 from typing import Any, AsyncGenerator, Dict, Mapping, Optional, Sequence, Union
 
 from anthropic import AsyncAnthropic
@@ -18,6 +20,8 @@ from autogen_core.components.models import (
 from autogen_core.components.tools import Tool, ToolSchema
 from .config import AnthropicClientConfiguration
 
+# Anthropic only distinguishes assistant turns; every other role is sent as user
+_ROLE_MAP = {"assistant": "assistant"}
 
 class BaseAnthropicChatCompletionClient(ChatCompletionClient):
     """Base class for Anthropic chat completion clients."""
@@ -48,29 +52,32 @@ class BaseAnthropicChatCompletionClient(ChatCompletionClient):
         """Create a client instance from configuration."""
         raise NotImplementedError("Subclasses must implement create_from_config")
 
-    def _get_default_capabilities(self, model: str) -> Dict[str, Any]:
-        """Get default capabilities for a model."""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_default_capabilities(model: str) -> Mapping[str, Any]:
+        """Get default capabilities for a model.
+
+        The result is cached per model and read-only, so it is shared by all clients.
+        """
         # Default capabilities for Claude models
-        return {
+        return MappingProxyType({
             "context_window": 100000,  # Claude has a large context window
             "supports_functions": True,  # Claude supports function calling
             "supports_json_output": True,  # Claude can output JSON
             "supports_streaming": True,  # Claude supports streaming
             "supports_vision": True,  # Claude supports vision (Claude 3)
-        }
+        })
 
     def _convert_messages(self, messages: Sequence[LLMMessage]) -> list[Message]:
-        """Convert LLMMessages to Anthropic Message format."""
-        converted = []
-        for msg in messages:
-            if msg.role == "system":
-                # Anthropic handles system messages differently
-                continue
-            converted.append({
-                "role": "assistant" if msg.role == "assistant" else "user",
-                "content": msg.content,
-            })
-        return converted
+        """Convert LLMMessages to Anthropic Message format.
+
+        Anthropic handles system messages differently, so they are skipped.
+        """
+        return [
+            {"role": _ROLE_MAP.get(msg.role, "user"), "content": msg.content}
+            for msg in messages
+            if msg.role != "system"
+        ]
 
     async def create(
         self,
@@ -104,7 +111,7 @@ class BaseAnthropicChatCompletionClient(ChatCompletionClient):
         return self._model_capabilities["context_window"] - used_tokens
 
     @property
-    def capabilities(self) -> Dict[str, Any]:
+    def capabilities(self) -> Mapping[str, Any]:
         """Get model capabilities."""
         return self._model_capabilities
 
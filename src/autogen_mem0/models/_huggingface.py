@@ -1,16 +1,24 @@
 """HuggingFace chat completion client implementation."""
 
+import asyncio
+import copy
+import functools
 import os
-from typing import Any, AsyncGenerator, Dict, List, Mapping, Optional, Sequence, Union
+import threading
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, Dict, List, Literal, Mapping, Optional, Sequence, Union
 from typing_extensions import Unpack
 
 import torch
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from transformers import (
     AutoModelForCausalLM,
     AutoTokenizer,
+    BitsAndBytesConfig,
     TextIteratorStreamer,
     GenerationConfig,
+    StoppingCriteria,
+    StoppingCriteriaList,
 )
 
 from autogen_core.base import CancellationToken
@@ -23,16 +31,148 @@ from autogen_core.components.models import (
 )
 from autogen_core.components.tools import Tool, ToolSchema
 
+# Smallest padded prompt length used when static_cache is enabled
+_MIN_PROMPT_BUCKET = 64
+
+# How long the micro-batcher waits for concurrent requests before running a batch
+_MICROBATCH_WINDOW_S = 0.005
+
+
+def _tune_torch_backends(torch_compile: bool) -> None:
+    """Switch on faster torch backend settings. These are process-wide, so only on request."""
+    # Allow the fused flash kernel when attention runs through SDPA
+    torch.backends.cuda.enable_flash_sdp(True)
+    # Use TF32 tensor cores for any remaining fp32 matmuls and convolutions
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    if torch_compile:
+        import torch._inductor.config as inductor_config
+
+        inductor_config.coordinate_descent_tuning = True
+        inductor_config.fx_graph_cache = True
+
+
+def _default_torch_dtype() -> str:
+    """Preferred weight dtype for this machine: bf16 where supported, else fp16 on GPU, else fp32."""
+    if torch.cuda.is_available():
+        return "bfloat16" if torch.cuda.is_bf16_supported() else "float16"
+    return "float32"
+
+
+def _resolve_torch_dtype(torch_dtype: Optional[str]) -> Union[str, torch.dtype]:
+    """Map a dtype name to a torch dtype, keeping "auto" as-is."""
+    torch_dtype = torch_dtype or _default_torch_dtype()
+    if torch_dtype == "auto":
+        return torch_dtype
+    return getattr(torch, torch_dtype)
+
+# from_pretrained arguments used unless the client configuration overrides them
+_HF_DEFAULTS: Mapping[str, Any] = MappingProxyType({
+    "device_map": "auto",
+    "trust_remote_code": True,
+})
+
+def _model_kwargs(config: Mapping[str, Any], auth_token: str) -> Dict[str, Any]:
+    """from_pretrained arguments for a model: the defaults plus any configured overrides."""
+    kwargs = {**_HF_DEFAULTS, "use_auth_token": auth_token}
+    if "device" in config:
+        kwargs["device_map"] = config["device"]
+    if config.get("attn_implementation"):
+        kwargs["attn_implementation"] = config["attn_implementation"]
+    return kwargs
+
+@functools.lru_cache(maxsize=8)
+def _load_tokenizer(model_name: str, auth_token: str) -> Any:
+    """Load a tokenizer once per (model, token) and share it across clients.
+
+    The returned tokenizer is shared, so callers must not mutate it.
+    """
+    return AutoTokenizer.from_pretrained(
+        model_name,
+        use_auth_token=auth_token,
+        trust_remote_code=True,
+    )
+
+class _CancellationCriteria(StoppingCriteria):
+    """Stop generation as soon as the cancellation token is cancelled."""
+
+    def __init__(self, cancellation_token: CancellationToken):
+        self._cancellation_token = cancellation_token
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any) -> torch.BoolTensor:
+        return torch.full(
+            (input_ids.shape[0],),
+            self._cancellation_token.is_cancelled(),
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+class _CancelledRowsCriteria(StoppingCriteria):
+    """Stop each row of a batched generation once its request's future is cancelled."""
+
+    def __init__(self, futures: Sequence[asyncio.Future]):
+        self._futures = futures
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any) -> torch.BoolTensor:
+        return torch.tensor(
+            [future.cancelled() for future in self._futures],
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+class _CountingTextIteratorStreamer(TextIteratorStreamer):
+    """TextIteratorStreamer that also counts the generated tokens it receives."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.n_tokens = 0
+
+    def put(self, value: torch.Tensor) -> None:
+        if not (self.skip_prompt and self.next_tokens_are_prompt):
+            self.n_tokens += value.shape[-1]
+        super().put(value)
+
 class HuggingFaceClientConfiguration(BaseModel):
-    """Configuration for HuggingFace client."""
+    """Configuration for HuggingFace client.
+
+    ``quantization="nf4"`` loads 4-bit weight-only quantized weights via
+    bitsandbytes, which cuts weight memory traffic for single-sequence decode.
+    ``"int8"`` (LLM.int8) is supported but is usually slower than fp16/bf16 at
+    batch size 1 because of its outlier decomposition, so prefer ``"nf4"`` for
+    this client's decode path.
+
+    ``assistant_model_name`` enables assisted (speculative) decoding with a
+    small draft model loaded with the same quantization and dtype settings.
+
+    ``attn_implementation`` is left to transformers by default, which uses
+    ``"sdpa"`` (PyTorch fused attention) where the model supports it and
+    ``"eager"`` otherwise. Setting it forces that backend, and loading fails
+    for models that do not support it. ``"flash_attention_2"`` requires
+    ``flash-attn>=2`` and fp16/bf16 weights.
+
+    ``tune_torch_backends`` enables the flash SDP kernel, TF32 matmuls and, with
+    ``torch_compile``, inductor autotuning and FX graph caching. These settings
+    and ``inductor_cache_dir`` apply to the whole process, not just this client,
+    so they are off unless requested.
+    """
     model_name: str
     device: str = "cuda" if torch.cuda.is_available() else "cpu"
-    torch_dtype: str = "auto"
+    torch_dtype: str = Field(default_factory=_default_torch_dtype)  # "bfloat16", "float16", "float32" or "auto"
     max_tokens: Optional[int] = None
     temperature: Optional[float] = None
     top_p: Optional[float] = None
     model_capabilities: Optional[ModelCapabilities] = None
     use_auth_token: Optional[str] = None
+    torch_compile: bool = False  # Compile the forward pass with torch.compile(mode="reduce-overhead")
+    inductor_cache_dir: Optional[str] = None  # Persistent TorchInductor cache, reused after unpickling (process-wide)
+    static_cache: bool = False  # Use a static KV cache and bucketed prompt lengths (pairs with torch_compile)
+    quantization: Literal["nf4", "int8", "none"] = "none"
+    bnb_4bit_use_double_quant: bool = True
+    attn_implementation: Optional[str] = None  # None lets transformers choose ("sdpa" where supported)
+    assistant_model_name: Optional[str] = None  # Draft model for speculative decoding; must share the tokenizer
+    enable_microbatch: bool = False  # Fuse concurrent plain create() calls into one padded generate
+    cuda_graphs: bool = False  # Replay decode steps as CUDA graphs (implies torch_compile and static_cache on CUDA)
+    tune_torch_backends: bool = False  # Process-wide flash SDP, TF32 and inductor tuning; changes fp32 numerics
 
 class HuggingFaceChatCompletionClient(ChatCompletionClient):
     """Chat completion client for HuggingFace transformer models."""
@@ -41,6 +181,11 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
         if "model_name" not in kwargs:
             raise ValueError("model_name is required for HuggingFaceChatCompletionClient")
             
+        if kwargs.get("cuda_graphs") and torch.cuda.is_available() and kwargs.get("device") != "cpu":
+            # reduce-overhead compilation records the decode step once and replays it as a
+            # CUDA graph; the static KV cache keeps its shapes fixed between steps
+            kwargs = {**kwargs, "torch_compile": True, "static_cache": True}
+            
         self._raw_config = dict(kwargs).copy()
         self._model_capabilities = kwargs.get("model_capabilities")
         
@@ -50,18 +195,9 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
             raise ValueError("use_auth_token must be provided in config")
             
         # Load model and tokenizer
-        self._model = AutoModelForCausalLM.from_pretrained(
-            kwargs["model_name"],
-            device_map=kwargs.get("device", "auto"),
-            torch_dtype=kwargs.get("torch_dtype", "auto"),
-            use_auth_token=auth_token,
-            trust_remote_code=True,
-        )
-        self._tokenizer = AutoTokenizer.from_pretrained(
-            kwargs["model_name"],
-            use_auth_token=auth_token,
-            trust_remote_code=True,
-        )
+        self._model = self._load_model(kwargs, auth_token)
+        self._assistant_model = self._load_assistant_model(kwargs, auth_token)
+        self._tokenizer = _load_tokenizer(kwargs["model_name"], auth_token)
         
         # Store generation config
         self._generation_config = GenerationConfig(
@@ -70,18 +206,246 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
             top_p=kwargs.get("top_p", 0.95),
             pad_token_id=self._tokenizer.eos_token_id,
         )
+        # Greedy/sampled single-beam decoding with KV cache; skip beam search setup
+        self._generation_config.use_cache = True
+        self._generation_config.num_beams = 1
+        self._generation_config.do_sample = bool(self._generation_config.temperature)
+        if kwargs.get("static_cache"):
+            self._generation_config.cache_implementation = "static"
+        
+        self._prompt_cache = functools.lru_cache(maxsize=128)(self._build_prompt)
+        
+        # Micro-batching state, started on first use in the running event loop
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_task: Optional[asyncio.Task] = None
         
         # Usage tracking
         self._total_prompt_tokens = 0
         self._total_completion_tokens = 0
         self._last_prompt_tokens = 0
         self._last_completion_tokens = 0
+
+        if kwargs.get("torch_compile"):
+            self._warmup()
+
+    def _load_model(self, config: Mapping[str, Any], auth_token: str) -> Any:
+        """Load the causal LM described by config, quantizing or compiling it if requested."""
+        load_kwargs: Dict[str, Any] = {}
+        quantization = config.get("quantization", "none")
+        if quantization == "nf4":
+            compute_dtype = _resolve_torch_dtype(config.get("torch_dtype"))
+            if compute_dtype == "auto":
+                compute_dtype = _resolve_torch_dtype(_default_torch_dtype())
+            load_kwargs["quantization_config"] = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=compute_dtype,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_use_double_quant=config.get("bnb_4bit_use_double_quant", True),
+            )
+        elif quantization == "int8":
+            load_kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+        else:
+            load_kwargs["torch_dtype"] = _resolve_torch_dtype(config.get("torch_dtype"))
+
+        if config.get("tune_torch_backends"):
+            _tune_torch_backends(bool(config.get("torch_compile")))
+
+        model = AutoModelForCausalLM.from_pretrained(
+            config["model_name"],
+            **_model_kwargs(config, auth_token),
+            **load_kwargs,
+        )
+        if config.get("torch_compile"):
+            if config.get("inductor_cache_dir"):
+                os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", config["inductor_cache_dir"])
+            # Compile forward rather than the module: generate() is looked up on the
+            # original module and would otherwise bypass the compiled graph. A static
+            # cache keeps decode shapes fixed, which allows a single full graph.
+            model.forward = torch.compile(
+                model.forward,
+                mode="reduce-overhead",
+                fullgraph=bool(config.get("static_cache")),
+            )
+        # Inference only: make sure dropout and other train-time behaviour is off
+        model.eval()
+        return model
+
+    def _load_assistant_model(self, config: Mapping[str, Any], auth_token: str) -> Optional[Any]:
+        """Load the speculative decoding draft model, if one is configured."""
+        if not config.get("assistant_model_name"):
+            return None
+        return self._load_model(
+            {**config, "model_name": config["assistant_model_name"], "torch_compile": False},
+            auth_token,
+        )
+
+    def _assisted_kwargs(self, json_output: Optional[bool], tools: Sequence[Tool | ToolSchema]) -> Dict[str, Any]:
+        """Speculative decoding arguments for generate; skipped for tool and JSON requests."""
+        if self._assistant_model is None or json_output or tools:
+            return {}
+        return {"assistant_model": self._assistant_model, "num_assistant_tokens": 5}
+
+    def _warmup(self) -> None:
+        """Run a one-token generation so compilation happens before the first request."""
+        inputs = self._tokenizer("Hello", return_tensors="pt").to(self._model.device)
+        with torch.inference_mode():
+            self._model.generate(**inputs, max_new_tokens=1, pad_token_id=self._tokenizer.eos_token_id)
         
+    def _encode(self, prompt: str) -> Any:
+        """Tokenize a prompt, record its token count and move it to the model device.
+
+        Tokenizer output is already on the CPU, so CPU models skip the copy.
+
+        With static_cache enabled the prompt is left-padded to a power-of-two
+        bucket so prefill shapes repeat and compiled graphs are reused.
+        """
+        inputs = self._tokenizer(prompt, return_tensors="pt")
+        prompt_len = inputs.input_ids.shape[1]
+        self._last_prompt_tokens = prompt_len
+        self._total_prompt_tokens += prompt_len
+
+        if self._raw_config.get("static_cache"):
+            pad = max(_MIN_PROMPT_BUCKET, 1 << (prompt_len - 1).bit_length()) - prompt_len
+            if pad:
+                inputs["input_ids"] = torch.nn.functional.pad(
+                    inputs["input_ids"], (pad, 0), value=self._generation_config.pad_token_id
+                )
+                inputs["attention_mask"] = torch.nn.functional.pad(inputs["attention_mask"], (pad, 0), value=0)
+
+        device = self._model.device
+        if device.type == "cuda":
+            # Pinned host memory lets the host-to-device copy run asynchronously
+            for name, tensor in inputs.items():
+                inputs[name] = tensor.pin_memory().to(device, non_blocking=True)
+        elif device.type != "cpu":
+            inputs = inputs.to(device)
+        return inputs
+
+    def _resolve_generation_config(
+        self, extra_create_args: Mapping[str, Any]
+    ) -> tuple[GenerationConfig, Dict[str, Any]]:
+        """Return the generation config for a call and any extra args it does not cover.
+
+        The shared config is reused as-is unless extra_create_args override it.
+        """
+        if not extra_create_args:
+            return self._generation_config, {}
+        generation_config = copy.deepcopy(self._generation_config)
+        unused = generation_config.update(**extra_create_args)
+        return generation_config, unused
+
+    def _generate_batch(
+        self, prompts: List[str], futures: Optional[Sequence[asyncio.Future]] = None
+    ) -> List[tuple[str, int, int]]:
+        """Generate completions for several prompts with one left-padded generate call.
+
+        Rows whose future in futures is cancelled stop generating early.
+        Returns (text, prompt_tokens, completion_tokens) for each prompt.
+        """
+        pad_token_id = self._generation_config.pad_token_id
+        encoded = self._tokenizer(prompts, return_attention_mask=False)["input_ids"]
+        max_len = max(len(ids) for ids in encoded)
+        input_ids = torch.full((len(encoded), max_len), pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(encoded), max_len), dtype=torch.long)
+        for row, ids in enumerate(encoded):
+            input_ids[row, max_len - len(ids):] = torch.tensor(ids)
+            attention_mask[row, max_len - len(ids):] = 1
+
+        generate_kwargs: Dict[str, Any] = {}
+        if futures is not None:
+            generate_kwargs["stopping_criteria"] = StoppingCriteriaList([_CancelledRowsCriteria(futures)])
+
+        with torch.inference_mode():
+            outputs = self._model.generate(
+                input_ids=input_ids.to(self._model.device),
+                attention_mask=attention_mask.to(self._model.device),
+                generation_config=self._generation_config,
+                **generate_kwargs,
+            )
+
+        gen_ids = outputs[:, max_len:]
+        texts = self._tokenizer.batch_decode(gen_ids, skip_special_tokens=True)
+        # Finished rows are padded after their eos, and pad is usually eos itself,
+        # so count each row up to and including its first eos
+        is_eos = gen_ids == self._tokenizer.eos_token_id
+        completion_tokens = torch.where(
+            is_eos.any(dim=1),
+            is_eos.int().argmax(dim=1) + 1,
+            gen_ids.shape[1],
+        ).tolist()
+        return [
+            (text.strip(), len(ids), n_tokens)
+            for text, ids, n_tokens in zip(texts, encoded, completion_tokens)
+        ]
+
+    async def _run_microbatches(self) -> None:
+        """Collect prompts that arrive within a short window and generate them together."""
+        batch: List[tuple[str, asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await self._batch_queue.get()]
+                await asyncio.sleep(_MICROBATCH_WINDOW_S)
+                while not self._batch_queue.empty():
+                    batch.append(self._batch_queue.get_nowait())
+                batch = [(prompt, future) for prompt, future in batch if not future.cancelled()]
+                if not batch:
+                    continue
+
+                futures = [future for _, future in batch]
+                try:
+                    results = await asyncio.to_thread(
+                        self._generate_batch, [prompt for prompt, _ in batch], futures
+                    )
+                except Exception as e:
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                for future, result in zip(futures, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            # Closing the client: nothing will answer the collected or queued requests
+            for _, future in batch:
+                future.cancel()
+            while not self._batch_queue.empty():
+                self._batch_queue.get_nowait()[1].cancel()
+
+    async def _generate_microbatched(
+        self, prompt: str, cancellation_token: Optional[CancellationToken] = None
+    ) -> tuple[str, int, int]:
+        """Queue a prompt for the micro-batcher and wait for its completion."""
+        loop = asyncio.get_running_loop()
+        if self._batch_task is None or self._batch_task.done():
+            self._batch_queue = asyncio.Queue()
+            self._batch_task = loop.create_task(self._run_microbatches())
+        future = loop.create_future()
+        if cancellation_token is not None:
+            cancellation_token.link_future(future)
+        self._batch_queue.put_nowait((prompt, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop the micro-batching task, cancelling any requests still waiting on it."""
+        task, self._batch_task = self._batch_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
     def __getstate__(self) -> Dict[str, Any]:
         """Get state for pickling."""
         state = self.__dict__.copy()
         state["_model"] = None
+        state["_assistant_model"] = None
         state["_tokenizer"] = None
+        # Cached prompts belong to the current tokenizer and are rebuilt after reload
+        del state["_prompt_cache"]
+        state["_batch_queue"] = None
+        state["_batch_task"] = None
         return state
         
     def __setstate__(self, state: Dict[str, Any]) -> None:
@@ -92,51 +456,65 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
         if not auth_token:
             raise ValueError("use_auth_token must be provided in config")
             
-        self._model = AutoModelForCausalLM.from_pretrained(
-            state["_raw_config"]["model_name"],
-            device_map=state["_raw_config"].get("device", "auto"),
-            torch_dtype=state["_raw_config"].get("torch_dtype", "auto"),
-            use_auth_token=auth_token,
-            trust_remote_code=True,
-        )
-        self._tokenizer = AutoTokenizer.from_pretrained(
-            state["_raw_config"]["model_name"],
-            use_auth_token=auth_token,
-            trust_remote_code=True,
+        self._model = self._load_model(state["_raw_config"], auth_token)
+        self._assistant_model = self._load_assistant_model(state["_raw_config"], auth_token)
+        self._tokenizer = _load_tokenizer(state["_raw_config"]["model_name"], auth_token)
+        self._prompt_cache = functools.lru_cache(maxsize=128)(self._build_prompt)
+
+        if state["_raw_config"].get("torch_compile"):
+            self._warmup()
+
+    def _render_template_uncached(self, key: tuple) -> str:
+        """Render (role, content) pairs with the tokenizer's chat template."""
+        return self._tokenizer.apply_chat_template(
+            [{"role": role, "content": content} for role, content in key],
+            tokenize=False,
+            add_generation_prompt=True
         )
 
     def _convert_messages(self, messages: Sequence[LLMMessage]) -> str:
-        """Convert messages to model input format."""
+        """Convert messages to model input format.
+
+        Prompts are cached by their (role, content) pairs, so repeated
+        conversions of the same messages skip rendering.
+        """
+        key = tuple((msg.role, msg.content) for msg in messages)
+        use_template = bool(self._tokenizer.chat_template)
+        try:
+            return self._prompt_cache(key, use_template)
+        except TypeError:
+            # Unhashable (e.g. multimodal) content cannot be cached
+            return self._build_prompt(key, use_template)
+
+    def _build_prompt(self, key: tuple, use_template: bool) -> str:
+        """Render (role, content) pairs as a prompt string."""
         system_message = None
         conversation = []
         
-        for msg in messages:
-            if msg.role == "system":
-                system_message = msg.content
+        for role, content in key:
+            if role == "system":
+                system_message = content
             else:
-                conversation.append({"role": msg.role, "content": msg.content})
+                conversation.append((role, content))
                 
         # Format as chat template if model supports it
-        if self._tokenizer.chat_template:
-            messages_dict = [{"role": "system", "content": system_message}] if system_message else []
-            messages_dict.extend(conversation)
-            return self._tokenizer.apply_chat_template(
-                messages_dict,
-                tokenize=False,
-                add_generation_prompt=True
-            )
+        if use_template:
+            template_key = (("system", system_message),) if system_message else ()
+            return self._render_template_uncached(template_key + tuple(conversation))
             
         # Otherwise format manually
-        formatted = ""
+        parts = []
         if system_message:
-            formatted += f"System: {system_message}\n\n"
+            parts.append(f"System: {system_message}\n\n")
             
-        for msg in conversation:
-            role = "Assistant" if msg["role"] == "assistant" else "Human"
-            formatted += f"{role}: {msg['content']}\n"
+        for role, content in conversation:
+            parts.append("Assistant" if role == "assistant" else "Human")
+            parts.append(": ")
+            parts.append(content)
+            parts.append("\n")
             
-        formatted += "Assistant:"
-        return formatted
+        parts.append("Assistant:")
+        return "".join(parts)
         
     async def create(
         self,
@@ -165,32 +543,46 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
             ]
             
         try:
-            # Encode input
-            inputs = self._tokenizer(prompt, return_tensors="pt").to(self._model.device)
-            self._last_prompt_tokens = len(inputs.input_ids[0])
-            self._total_prompt_tokens += self._last_prompt_tokens
-            
-            # Generate
-            with torch.no_grad():
-                outputs = self._model.generate(
-                    **inputs,
-                    generation_config=self._generation_config,
-                    **extra_create_args,
-                    **create_args
+            if self._raw_config.get("enable_microbatch") and not extra_create_args and not create_args:
+                # Requests with the shared generation config can be fused with concurrent ones
+                response_text, prompt_tokens, completion_tokens = await self._generate_microbatched(
+                    prompt, cancellation_token
                 )
+                self._last_prompt_tokens = prompt_tokens
+                self._total_prompt_tokens += prompt_tokens
+            else:
+                # Encode input
+                inputs = self._encode(prompt)
+                
+                # Read back before any await, so a concurrent request cannot overwrite it
+                prompt_tokens = self._last_prompt_tokens
                 
-            # Decode output
-            output_text = self._tokenizer.decode(outputs[0], skip_special_tokens=True)
-            response_text = output_text[len(prompt):].strip()
+                # Generate
+                generation_config, model_kwargs = self._resolve_generation_config(extra_create_args)
+                with torch.inference_mode():
+                    outputs = self._model.generate(
+                        **inputs,
+                        generation_config=generation_config,
+                        **model_kwargs,
+                        **self._assisted_kwargs(json_output, tools),
+                        **create_args
+                    )
+                    
+                # Decode only the generated tokens
+                gen_ids = outputs[0, inputs.input_ids.shape[1]:]
+                response_text = self._tokenizer.decode(gen_ids, skip_special_tokens=True).strip()
+                completion_tokens = gen_ids.shape[0]
             
             # Update completion tokens
-            self._last_completion_tokens = len(outputs[0]) - len(inputs.input_ids[0])
+            self._last_completion_tokens = completion_tokens
             self._total_completion_tokens += self._last_completion_tokens
             
+            # Usage for this request; actual_usage() may already reflect a concurrent one
             return CreateResult(
                 content=response_text,
                 role="assistant",
                 tool_calls=None,  # TODO: Add tool call parsing
+                usage=RequestUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
             )
             
         except Exception as e:
@@ -224,35 +616,54 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
             
         try:
             # Encode input
-            inputs = self._tokenizer(prompt, return_tensors="pt").to(self._model.device)
-            self._last_prompt_tokens = len(inputs.input_ids[0])
-            self._total_prompt_tokens += self._last_prompt_tokens
+            inputs = self._encode(prompt)
             
             # Setup streamer
-            streamer = TextIteratorStreamer(
+            streamer = _CountingTextIteratorStreamer(
                 self._tokenizer,
                 skip_prompt=True,
                 skip_special_tokens=True
             )
             
             # Generate in background
+            generation_config, model_kwargs = self._resolve_generation_config(extra_create_args)
             generation_kwargs = {
                 **inputs,
-                "generation_config": self._generation_config,
-                **extra_create_args,
+                "generation_config": generation_config,
+                **model_kwargs,
+                **self._assisted_kwargs(json_output, tools),
                 **create_args,
                 "streamer": streamer,
             }
+            if cancellation_token is not None:
+                generation_kwargs["stopping_criteria"] = StoppingCriteriaList(
+                    [_CancellationCriteria(cancellation_token)]
+                )
             
-            with torch.no_grad():
-                self._model.generate(**generation_kwargs)
+            # Set by the worker thread if generation fails, and raised once the stream drains
+            generate_error: List[BaseException] = []
+
+            def _generate() -> None:
+                try:
+                    with torch.inference_mode():
+                        self._model.generate(**generation_kwargs)
+                except Exception as e:
+                    generate_error.append(e)
+                    # Unblock the consumer if generation fails part way
+                    streamer.end()
+
+            thread = threading.Thread(target=_generate, daemon=True)
+            thread.start()
                 
-            # Stream tokens
-            async for text in streamer:
+            # Stream tokens without blocking the event loop on the streamer queue
+            while (text := await asyncio.to_thread(next, streamer, None)) is not None:
                 yield text
                 
+            if generate_error:
+                raise generate_error[0]
+                
             # Update completion tokens
-            self._last_completion_tokens = len(streamer.tokens)
+            self._last_completion_tokens = streamer.n_tokens
             self._total_completion_tokens += self._last_completion_tokens
                 
         except Exception as e:
@@ -273,7 +684,11 @@ class HuggingFaceChatCompletionClient(ChatCompletionClient):
         )
         
     def count_tokens(self, messages: Sequence[LLMMessage], tools: Sequence[Tool | ToolSchema] = []) -> int:
-        """Count the number of tokens in the input."""
+        """Count the number of tokens in the input.
+
+        The rendered prompt is counted, chat-template markers and special tokens
+        included, so the count matches what generation receives.
+        """
         prompt = self._convert_messages(messages)
         
         if tools:
@@ -1,8 +1,9 @@
 """Memory-enabled Anthropic chat completion client using mem0."""
 
+import asyncio
 import logging
 import uuid
-from typing import Any, Dict, List, Optional, Sequence, Union, AsyncGenerator, Mapping
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union, AsyncGenerator, Mapping
 from autogen_core.components import FunctionCall
 from autogen_core.components.models import (
     ChatCompletionClient,
@@ -32,6 +33,16 @@ logger = logging.getLogger(__name__)
 class Mem0AnthropicChatCompletionClient(ChatCompletionClient):
     """Chat completion client using Mem0's proxy with memory integration."""
 
+    # Converters from message type to mem0 message dict
+    _MSG_BUILDERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+        SystemMessage: lambda m: {"role": "system", "content": m.content},
+        UserMessage: lambda m: {"role": "user", "content": m.content},
+        AssistantMessage: lambda m: {"role": "assistant", "content": m.content},
+        FunctionExecutionResultMessage: lambda m: {"role": "function", "name": m.name, "content": m.content},
+        ToolCallMessage: lambda m: {"role": "assistant", "content": m.content, "name": m.name},
+        ToolCallResultMessage: lambda m: {"role": "tool", "name": m.name, "content": m.content},
+    }
+
     def __init__(
             self,
             memory_config: Dict,
@@ -61,19 +72,40 @@ class Mem0AnthropicChatCompletionClient(ChatCompletionClient):
         if not self._model:
             raise ValueError("Model name must be specified in memory_config.llm.config")
         
-        # Store session identifiers
-        self._user_id = user_id or str(uuid.uuid4())
-        self._agent_id = agent_id or str(uuid.uuid4())
-        self._session_id = session_id or str(uuid.uuid4())
+        # Store session identifiers; missing ones are generated on first use
+        self._user_id = user_id
+        self._agent_id = agent_id
+        self._session_id = session_id
         self._enable_memory = enable_memory
         
-        logger.info(f"Initialized mem0 client with user_id={self._user_id}, agent_id={self._agent_id}, session_id={self._session_id}")
+        logger.info(f"Initialized mem0 client with user_id={user_id}, agent_id={agent_id}, session_id={session_id}")
         
         # Track usage
         self._actual_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         self._total_usage = RequestUsage(prompt_tokens=0, completion_tokens=0)
         
         
+    @property
+    def user_id(self) -> str:
+        """User ID for memory operations."""
+        if self._user_id is None:
+            self._user_id = str(uuid.uuid4())
+        return self._user_id
+
+    @property
+    def agent_id(self) -> str:
+        """Agent ID for memory operations."""
+        if self._agent_id is None:
+            self._agent_id = str(uuid.uuid4())
+        return self._agent_id
+
+    @property
+    def session_id(self) -> str:
+        """Session ID for memory operations."""
+        if self._session_id is None:
+            self._session_id = str(uuid.uuid4())
+        return self._session_id
+
     async def create(
         self,
         messages: Sequence[LLMMessage],
@@ -85,63 +117,36 @@ class Mem0AnthropicChatCompletionClient(ChatCompletionClient):
         """Create a chat completion with optional memory integration."""
         # Convert messages to mem0 format
         mem0_messages = []
+        has_non_system = False
         for msg in messages:
-            if isinstance(msg, SystemMessage):
-                mem0_messages.append({
-                    "role": "system",
-                    "content": msg.content
-                })
-            elif isinstance(msg, UserMessage):
-                mem0_messages.append({
-                    "role": "user",
-                    "content": msg.content
-                })
-            elif isinstance(msg, AssistantMessage):
-                mem0_messages.append({
-                    "role": "assistant",
-                    "content": msg.content
-                })
-            elif isinstance(msg, FunctionExecutionResultMessage):
-                mem0_messages.append({
-                    "role": "function",
-                    "name": msg.name,
-                    "content": msg.content
-                })
-            elif isinstance(msg, ToolCallMessage):
-                mem0_messages.append({
-                    "role": "assistant",
-                    "content": msg.content,
-                    "name": msg.name,
-                })
-            elif isinstance(msg, ToolCallResultMessage):
-                mem0_messages.append({
-                    "role": "tool",
-                    "name": msg.name,
-                    "content": msg.content
-                })
+            builder = self._MSG_BUILDERS.get(type(msg))
+            if builder is None:
+                continue
+            mem0_message = builder(msg)
+            has_non_system = has_non_system or mem0_message["role"] != "system"
+            mem0_messages.append(mem0_message)
 
         # Ensure first non-system message is a user message for Anthropic
-        if not mem0_messages:
-            mem0_messages.append({"role": "user", "content": "."})
-        elif all(msg["role"] == "system" for msg in mem0_messages):
+        if not has_non_system:
             mem0_messages.append({"role": "user", "content": "."})
         
         # Get memory parameters from extra_create_args
         memory_args = {}
         if self._enable_memory:
             memory_args.update({
-                "user_id": extra_create_args.get("user_id", self._user_id),
-                "agent_id": extra_create_args.get("agent_id", self._agent_id),
-                "run_id": extra_create_args.get("run_id", self._session_id),
+                "user_id": extra_create_args["user_id"] if "user_id" in extra_create_args else self.user_id,
+                "agent_id": extra_create_args["agent_id"] if "agent_id" in extra_create_args else self.agent_id,
+                "run_id": extra_create_args["run_id"] if "run_id" in extra_create_args else self.session_id,
                 "metadata": extra_create_args.get("metadata"),
                 "filters": extra_create_args.get("filters"),
                 "limit": extra_create_args.get("limit", 10),
             })
         
         try:
-            # Create completion through mem0 (synchronous call)
+            # Create completion through mem0 (synchronous call, run off the event loop)
             logger.debug(f"Creating completion with model={self._model}, user_id={memory_args.get('user_id')}, agent_id={memory_args.get('agent_id')}, run_id={memory_args.get('run_id')}")
-            response = self._mem0.chat.completions.create(
+            response = await asyncio.to_thread(
+                self._mem0.chat.completions.create,
                 model=self._model,  # Use stored model name
                 messages=mem0_messages,
                 **memory_args,
@@ -1,7 +1,11 @@
 """Model information for Anthropic models."""
 
-from typing import Dict
+import functools
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Sequence
 
+import numpy as np
 from autogen_core.components.models import ModelCapabilities
 
 # Based on: https://docs.anthropic.com/claude/docs/models-overview
@@ -33,124 +37,146 @@ _MODEL_POINTERS = {
     "claude-3-haiku@20240307": "claude-3-haiku-20240307",
 }
 
-_MODEL_CAPABILITIES: Dict[str, ModelCapabilities] = {
-    # Claude 3.5 Models
-    "claude-3-5-sonnet-20241022": {
-        "vision": True,
-        "function_calling": True,
-        "json_output": True,
-        "message_batches": True,
-    },
-    "claude-3-5-haiku-20241022": {
-        "vision": False,
-        "function_calling": True,
-        "json_output": True,
-        "message_batches": True,
-    },
-    
-    # Claude 3 Models
-    "claude-3-opus-20240229": {
-        "vision": True,
-        "function_calling": True,
-        "json_output": True,
-        "message_batches": True,
-    },
-    "claude-3-sonnet-20240229": {
-        "vision": True,
-        "function_calling": True,
-        "json_output": True,
-        "message_batches": False,
-    },
-    "claude-3-haiku-20240307": {
-        "vision": True,
-        "function_calling": True,
-        "json_output": True,
-        "message_batches": True,
-    },
-}
+@dataclass(frozen=True, slots=True)
+class ModelInfo:
+    """Static information about a model."""
+    context_window: int
+    max_output_tokens: int
+    input_price_per_mtok: float  # USD per million input tokens
+    output_price_per_mtok: float  # USD per million output tokens
+    capabilities: ModelCapabilities
+
 
-_MODEL_TOKEN_LIMITS: Dict[str, int] = {
+_CONTEXT_200K = 200000
+
+_MODEL_INFO: Dict[str, ModelInfo] = {
     # Claude 3.5 Models - 200K context, 8K output
-    "claude-3-5-sonnet-20241022": 200000,
-    "claude-3-5-haiku-20241022": 200000,
+    "claude-3-5-sonnet-20241022": ModelInfo(
+        context_window=_CONTEXT_200K,
+        max_output_tokens=8192,
+        input_price_per_mtok=3.00,
+        output_price_per_mtok=15.00,
+        capabilities=MappingProxyType({
+            "vision": True,
+            "function_calling": True,
+            "json_output": True,
+            "message_batches": True,
+        }),
+    ),
+    "claude-3-5-haiku-20241022": ModelInfo(
+        context_window=_CONTEXT_200K,
+        max_output_tokens=8192,
+        input_price_per_mtok=1.00,
+        output_price_per_mtok=5.00,
+        capabilities=MappingProxyType({
+            "vision": False,
+            "function_calling": True,
+            "json_output": True,
+            "message_batches": True,
+        }),
+    ),
     
     # Claude 3 Models - 200K context, 4K output
-    "claude-3-opus-20240229": 200000,
-    "claude-3-sonnet-20240229": 200000,
-    "claude-3-haiku-20240307": 200000,
+    "claude-3-opus-20240229": ModelInfo(
+        context_window=_CONTEXT_200K,
+        max_output_tokens=4096,
+        input_price_per_mtok=15.00,
+        output_price_per_mtok=75.00,
+        capabilities=MappingProxyType({
+            "vision": True,
+            "function_calling": True,
+            "json_output": True,
+            "message_batches": True,
+        }),
+    ),
+    "claude-3-sonnet-20240229": ModelInfo(
+        context_window=_CONTEXT_200K,
+        max_output_tokens=4096,
+        input_price_per_mtok=3.00,
+        output_price_per_mtok=15.00,
+        capabilities=MappingProxyType({
+            "vision": True,
+            "function_calling": True,
+            "json_output": True,
+            "message_batches": False,
+        }),
+    ),
+    "claude-3-haiku-20240307": ModelInfo(
+        context_window=_CONTEXT_200K,
+        max_output_tokens=4096,
+        input_price_per_mtok=0.25,
+        output_price_per_mtok=1.25,
+        capabilities=MappingProxyType({
+            "vision": True,
+            "function_calling": True,
+            "json_output": True,
+            "message_batches": True,
+        }),
+    ),
 }
 
-_MODEL_MAX_OUTPUT_TOKENS: Dict[str, int] = {
-    # Claude 3.5 Models
-    "claude-3-5-sonnet-20241022": 8192,
-    "claude-3-5-haiku-20241022": 8192,
-    
-    # Claude 3 Models
-    "claude-3-opus-20240229": 4096,
-    "claude-3-sonnet-20240229": 4096,
-    "claude-3-haiku-20240307": 4096,
-}
+# Used for models that are not listed above
+_DEFAULT_MODEL_INFO = ModelInfo(
+    context_window=100000,
+    max_output_tokens=4096,
+    input_price_per_mtok=0.0,
+    output_price_per_mtok=0.0,
+    capabilities=MappingProxyType({
+        "vision": False,
+        "function_calling": False,
+        "json_output": False,
+        "message_batches": False,
+    }),
+)
 
-_MODEL_PRICING: Dict[str, Dict[str, float]] = {
-    # Claude 3.5 Models
-    "claude-3-5-sonnet-20241022": {
-        "input_price_per_mtok": 3.00,   # $3.00 per million input tokens
-        "output_price_per_mtok": 15.00,  # $15.00 per million output tokens
-    },
-    "claude-3-5-haiku-20241022": {
-        "input_price_per_mtok": 1.00,   # $1.00 per million input tokens
-        "output_price_per_mtok": 5.00,  # $5.00 per million output tokens
-    },
-    
-    # Claude 3 Models
-    "claude-3-opus-20240229": {
-        "input_price_per_mtok": 15.00,  # $15.00 per million input tokens
-        "output_price_per_mtok": 75.00,  # $75.00 per million output tokens
-    },
-    "claude-3-sonnet-20240229": {
-        "input_price_per_mtok": 3.00,   # $3.00 per million input tokens
-        "output_price_per_mtok": 15.00,  # $15.00 per million output tokens
-    },
-    "claude-3-haiku-20240307": {
-        "input_price_per_mtok": 0.25,   # $0.25 per million input tokens
-        "output_price_per_mtok": 1.25,  # $1.25 per million output tokens
-    },
-}
+# Model info keyed by canonical name and by every pointer to it, built once at import
+_MODELS: Mapping[str, ModelInfo] = MappingProxyType({
+    **{alias: _MODEL_INFO[canonical] for alias, canonical in _MODEL_POINTERS.items()},
+    **_MODEL_INFO,
+})
+
+# Per-token prices indexed by model; the final slot holds the zero price for unknown models
+_PRICE_INDEX: Mapping[str, int] = MappingProxyType({model: i for i, model in enumerate(_MODELS)})
+_UNKNOWN_PRICE_INDEX = len(_PRICE_INDEX)
+_INPUT_PRICES = np.array(
+    [info.input_price_per_mtok for info in _MODELS.values()] + [_DEFAULT_MODEL_INFO.input_price_per_mtok]
+) / 1_000_000
+_OUTPUT_PRICES = np.array(
+    [info.output_price_per_mtok for info in _MODELS.values()] + [_DEFAULT_MODEL_INFO.output_price_per_mtok]
+) / 1_000_000
 
 def resolve_model(model: str) -> str:
     """Resolve a model pointer to its actual model name."""
     return _MODEL_POINTERS.get(model, model)
 
+def get_model_info(model: str) -> ModelInfo:
+    """Get all static information about a model."""
+    return _MODELS.get(model, _DEFAULT_MODEL_INFO)
+
 def get_capabilities(model: str) -> ModelCapabilities:
     """Get the capabilities of a model."""
-    model = resolve_model(model)
-    return _MODEL_CAPABILITIES.get(model, {
-        "vision": False,
-        "function_calling": False,
-        "json_output": False,
-        "message_batches": False,
-    })
+    return get_model_info(model).capabilities
 
 def get_token_limit(model: str) -> int:
     """Get the token limit (context window) for a model."""
-    model = resolve_model(model)
-    return _MODEL_TOKEN_LIMITS.get(model, 100000)  # Default to 100k if unknown
+    return get_model_info(model).context_window  # 100k if unknown
 
 def get_max_output_tokens(model: str) -> int:
     """Get the maximum output tokens for a model."""
-    model = resolve_model(model)
-    return _MODEL_MAX_OUTPUT_TOKENS.get(model, 4096)  # Default to 4k if unknown
+    return get_model_info(model).max_output_tokens  # 4k if unknown
 
-def get_model_pricing(model: str) -> Dict[str, float]:
+@functools.lru_cache(maxsize=64)
+def get_model_pricing(model: str) -> Mapping[str, float]:
     """Get the pricing information for a model.
     
     Returns:
-        Dict with input_price_per_mtok and output_price_per_mtok in USD.
+        Read-only mapping with input_price_per_mtok and output_price_per_mtok in USD,
+        shared between calls for the same model.
     """
-    model = resolve_model(model)
-    return _MODEL_PRICING.get(model, {
-        "input_price_per_mtok": 0.0,
-        "output_price_per_mtok": 0.0,
+    info = get_model_info(model)
+    return MappingProxyType({
+        "input_price_per_mtok": info.input_price_per_mtok,
+        "output_price_per_mtok": info.output_price_per_mtok,
     })
 
 def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
@@ -164,7 +190,30 @@ def calculate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
     Returns:
         Total cost in USD
     """
-    pricing = get_model_pricing(model)
-    input_cost = (input_tokens / 1_000_000) * pricing["input_price_per_mtok"]
-    output_cost = (output_tokens / 1_000_000) * pricing["output_price_per_mtok"]
+    info = get_model_info(model)
+    input_cost = (input_tokens / 1_000_000) * info.input_price_per_mtok
+    output_cost = (output_tokens / 1_000_000) * info.output_price_per_mtok
     return input_cost + output_cost
+
+def calculate_cost_batch(
+    models: Iterable[str],
+    input_tokens: Sequence[int] | np.ndarray,
+    output_tokens: Sequence[int] | np.ndarray,
+) -> np.ndarray:
+    """Calculate the cost in USD for many requests at once.
+    
+    Args:
+        models: The model name of each request
+        input_tokens: Number of input tokens of each request
+        output_tokens: Number of output tokens of each request
+        
+    Returns:
+        Array with the cost in USD of each request
+    """
+    idx = np.fromiter(
+        (_PRICE_INDEX.get(model, _UNKNOWN_PRICE_INDEX) for model in models),
+        dtype=np.intp,
+    )
+    inp = np.asarray(input_tokens, dtype=np.float64)
+    out = np.asarray(output_tokens, dtype=np.float64)
+    return inp * _INPUT_PRICES[idx] + out * _OUTPUT_PRICES[idx]
@@ -1,9 +1,10 @@
 import pytest
+import pytest_asyncio
 import asyncio
 import os
 import logging
 from typing import List, Sequence
-from decimal import Decimal, ROUND_HALF_UP
+from math import isclose
 
 from autogen_mem0.core.messaging import (
     Message,
@@ -15,22 +16,28 @@ from autogen_core.components.models import CreateResult
 from autogen_mem0.models import AnthropicChatCompletionClient
 from autogen_mem0.models._model_info import calculate_cost, get_model_pricing
 
-# Configure logging
+# Configure logging; set TEST_VERBOSE for debug output
+_LEVEL = logging.DEBUG if os.getenv("TEST_VERBOSE") else logging.WARNING
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
 # Enable debug logging for our module
-logging.getLogger('autogen_mem0').setLevel(logging.DEBUG)
+if os.getenv("TEST_VERBOSE"):
+    logging.getLogger('autogen_mem0').setLevel(logging.DEBUG)
 
-@pytest.fixture
-async def client() -> AnthropicChatCompletionClient:
-    """Fixture to create an Anthropic client for tests."""
+@pytest.fixture(scope="module")
+def api_key() -> str:
+    """Fixture for the Anthropic API key; skips the test when it is not set."""
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         pytest.skip("ANTHROPIC_API_KEY environment variable not set")
-    
+    return api_key
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client(api_key: str) -> AnthropicChatCompletionClient:
+    """Fixture to create one Anthropic client shared by the tests in this module."""
     return AnthropicChatCompletionClient(
         api_key=api_key,
         model="claude-3-opus-20240229",
@@ -38,15 +45,18 @@ async def client() -> AnthropicChatCompletionClient:
         max_tokens=1024,
     )
 
+# Validated once at import; tests only read these messages
+_BASIC: Sequence[Message] = [
+    SystemMessage(content="You are a helpful AI assistant."),
+    UserMessage(content="What is the capital of France?", source="user")
+]
+
 @pytest.fixture
 def basic_messages() -> Sequence[Message]:
     """Fixture for a basic message list."""
-    return [
-        SystemMessage(content="You are a helpful AI assistant."),
-        UserMessage(content="What is the capital of France?", source="user")
-    ]
+    return _BASIC
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_simple_completion(
     client: AnthropicChatCompletionClient,
     basic_messages: Sequence[Message]
@@ -60,7 +70,7 @@ async def test_simple_completion(
     assert len(result.content) > 0
     assert "paris" in result.content.lower()
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_streaming_completion(
     client: AnthropicChatCompletionClient,
     basic_messages: Sequence[Message]
@@ -68,17 +78,18 @@ async def test_streaming_completion(
     """Test streaming completion functionality."""
     chunks = []
     async for chunk in client.create_stream(basic_messages):
-        assert isinstance(chunk, (str, CreateResult))
-        if isinstance(chunk, str):
+        # Text chunks are the common case; only the final result needs a type check
+        if type(chunk) is str:
             chunks.append(chunk)
         else:
+            assert isinstance(chunk, CreateResult)
             chunks.append(chunk.content)
     
     complete_response = "".join(chunks)
     assert len(complete_response) > 0
     assert "paris" in complete_response.lower()
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_multiple_messages(client: AnthropicChatCompletionClient) -> None:
     """Test conversation with multiple back-and-forth messages."""
     messages: Sequence[Message] = [
@@ -90,7 +101,7 @@ async def test_multiple_messages(client: AnthropicChatCompletionClient) -> None:
     result = await client.create(messages)
     assert "4" in result.content
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_long_conversation(client: AnthropicChatCompletionClient) -> None:
     """Test handling of a longer conversation."""
     messages: Sequence[Message] = [
@@ -104,13 +115,13 @@ async def test_long_conversation(client: AnthropicChatCompletionClient) -> None:
     assert len(result.content) > 0
     assert "list comprehension" in result.content.lower()
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_empty_messages(client: AnthropicChatCompletionClient) -> None:
     """Test handling of empty messages list."""
     with pytest.raises(Exception):  
         await client.create([])
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_invalid_message_type(client: AnthropicChatCompletionClient) -> None:
     """Test handling of invalid message type."""
     messages = [{"content": "This is not a valid message type"}]  
@@ -118,26 +129,23 @@ async def test_invalid_message_type(client: AnthropicChatCompletionClient) -> No
     with pytest.raises(Exception):
         await client.create(messages)
 
-@pytest.mark.asyncio
-async def test_temperature_affects_output(
-    client: AnthropicChatCompletionClient
-) -> None:
+@pytest.mark.asyncio(loop_scope="module")
+async def test_temperature_affects_output(api_key: str) -> None:
     """Test that different temperature values produce different outputs."""
     messages: Sequence[Message] = [
         SystemMessage(content="You are a helpful AI assistant."),
         UserMessage(content="Tell me a creative story about a magical forest. Make it unique and different each time.", source="user")
     ]
     
-    # Create two clients with different temperatures
+    # Two clients with different temperatures
     client1 = AnthropicChatCompletionClient(
-        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        api_key=api_key,
         model="claude-3-opus-20240229",
         temperature=0.0,
         max_tokens=1024,
     )
-    
     client2 = AnthropicChatCompletionClient(
-        api_key=os.getenv("ANTHROPIC_API_KEY"),
+        api_key=api_key,
         model="claude-3-opus-20240229",
         temperature=1.0,
         max_tokens=1024,
@@ -167,11 +175,10 @@ async def test_cost_calculation() -> None:
     # Calculate actual cost
     actual_cost = calculate_cost(model, input_tokens, output_tokens)
     
-    # Use Decimal for precise comparison
-    assert Decimal(str(actual_cost)).quantize(Decimal('0.000001'), rounding=ROUND_HALF_UP) == \
-           Decimal(str(expected_cost)).quantize(Decimal('0.000001'), rounding=ROUND_HALF_UP)
+    # Costs must agree to the micro-dollar
+    assert isclose(actual_cost, expected_cost, rel_tol=0, abs_tol=1e-6)
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_client_cost_tracking(client: AnthropicChatCompletionClient) -> None:
     """Test cost tracking in the client."""
     messages: Sequence[Message] = [
@@ -179,24 +186,26 @@ async def test_client_cost_tracking(client: AnthropicChatCompletionClient) -> No
         UserMessage(content="Say 'hello' in exactly one word.", source="user")
     ]
     
-    # First request
-    result1 = await client.create(messages)
-    assert client.last_request_cost > 0, "Cost should be greater than 0"
-    first_request_cost = client.last_request_cost
-    first_total_cost = client.total_cost
+    # The client is shared across the module, so measure from the current total
+    starting_total_cost = client.total_cost
     
-    # Second request
-    result2 = await client.create(messages)
-    assert client.last_request_cost > 0, "Cost should be greater than 0"
-    second_request_cost = client.last_request_cost
+    async def request_cost() -> float:
+        # create() records the cost before returning, with no await in between,
+        # so reading it right after our own await sees this request's cost
+        await client.create(messages)
+        return client.last_request_cost
+    
+    first_request_cost, second_request_cost = await asyncio.gather(request_cost(), request_cost())
+    assert first_request_cost > 0, "Cost should be greater than 0"
+    assert second_request_cost > 0, "Cost should be greater than 0"
     
     # Verify total cost is sum of both requests
-    assert abs(client.total_cost - (first_request_cost + second_request_cost)) < 0.000001, \
+    assert abs(client.total_cost - starting_total_cost - (first_request_cost + second_request_cost)) < 0.000001, \
            "Total cost should be sum of individual request costs"
-    assert client.total_cost > first_total_cost, "Total cost should increase with each request"
+    assert client.total_cost > starting_total_cost + first_request_cost, "Total cost should increase with each request"
 
-@pytest.mark.asyncio
-async def test_cost_with_different_models() -> None:
+@pytest.mark.asyncio(loop_scope="module")
+async def test_cost_with_different_models(api_key: str) -> None:
     """Test cost calculation with different models."""
     messages: Sequence[Message] = [
         SystemMessage(content="You are a helpful AI assistant."),
@@ -210,21 +219,18 @@ async def test_cost_with_different_models() -> None:
         "claude-3-haiku-20240307"
     ]
     
-    costs = {}
-    for model in models:
-        api_key = os.getenv("ANTHROPIC_API_KEY")
-        if not api_key:
-            pytest.skip("ANTHROPIC_API_KEY environment variable not set")
-        
+    async def request_cost(model: str) -> float:
         client = AnthropicChatCompletionClient(
             api_key=api_key,
             model=model,
             temperature=0.7,
             max_tokens=1024,
         )
-        
-        result = await client.create(messages)
-        costs[model] = client.last_request_cost
+        await client.create(messages)
+        return client.last_request_cost
+    
+    # The requests are independent, so issue them concurrently
+    costs = dict(zip(models, await asyncio.gather(*(request_cost(model) for model in models))))
     
     # Verify relative costs (Opus > Sonnet > Haiku)
     assert costs["claude-3-opus-20240229"] > costs["claude-3-sonnet-20240229"], \
@@ -2,35 +2,78 @@
 
 import os
 import pytest
+from types import SimpleNamespace
 from typing import Generator
 import torch
 
 from autogen_mem0.models._huggingface import (
     HuggingFaceChatCompletionClient,
     HuggingFaceClientConfiguration,
+    _load_tokenizer,
 )
-from autogen_core.components.models import (
-    LLMMessage,
-    ModelCapabilities,
-)
+from autogen_core.components.models import ModelCapabilities
+
+# Mock payloads are never mutated, so they are built once for the module
+_GEN_OUT = torch.tensor([[1, 2, 3]])
+_ENC_OUT = [1, 2, 3]
+
+def _message(role, content):
+    """Chat message carrying the role and content attributes the client reads.
+
+    LLMMessage is a Union of message types and cannot be instantiated directly.
+    """
+    return SimpleNamespace(role=role, content=content)
+
+@pytest.fixture(autouse=True)
+def clear_tokenizer_cache():
+    """Keep tokenizers cached by one test from leaking into the next."""
+    _load_tokenizer.cache_clear()
+    yield
+    _load_tokenizer.cache_clear()
 
 @pytest.fixture
 def mock_model(mocker):
     """Mock HuggingFace model."""
     mock = mocker.MagicMock()
     mock.device = torch.device("cpu")
-    mock.generate.return_value = torch.tensor([[1, 2, 3]])
+    mock.generate.return_value = _GEN_OUT
     return mock
 
+class _Encoding(dict):
+    """Tokenizer output with attribute access, like transformers' BatchEncoding."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def to(self, device):
+        return self
+
+class _FakeTokenizer(SimpleNamespace):
+    """Tokenizer double with plain attributes; calling it delegates to ``encode_call``."""
+
+    def __call__(self, *args, **kwargs):
+        return self.encode_call(*args, **kwargs)
+
 @pytest.fixture
-def mock_tokenizer(mocker):
-    """Mock HuggingFace tokenizer."""
-    mock = mocker.MagicMock()
-    mock.chat_template = None
-    mock.encode.return_value = [1, 2, 3]
-    mock.decode.return_value = "Test response"
-    mock.eos_token_id = 2
-    return mock
+def mock_tokenizer():
+    """Fake HuggingFace tokenizer.
+
+    Tests that assert on calls replace the relevant attribute with a Mock.
+    """
+    return _FakeTokenizer(
+        chat_template=None,
+        encode=lambda *args, **kwargs: _ENC_OUT,
+        decode=lambda *args, **kwargs: "Test response",
+        eos_token_id=2,
+        apply_chat_template=lambda *args, **kwargs: "Template output",
+        encode_call=lambda *args, **kwargs: _Encoding(
+            input_ids=torch.tensor([_ENC_OUT]),
+            attention_mask=torch.ones(1, len(_ENC_OUT), dtype=torch.long),
+        ),
+    )
 
 @pytest.fixture
 def mock_auto_model(mocker, mock_model):
@@ -52,6 +95,7 @@ def client(mock_auto_model, mock_auto_tokenizer):
     return HuggingFaceChatCompletionClient(
         model_name="test/model",
         device="cpu",
+        use_auth_token="test-token",
         max_tokens=100,
         temperature=0.7,
     )
@@ -63,30 +107,64 @@ def test_init_requires_model_name():
 
 def test_init_loads_model_and_tokenizer(mock_auto_model, mock_auto_tokenizer):
     """Test that model and tokenizer are loaded correctly."""
-    client = HuggingFaceChatCompletionClient(model_name="test/model")
+    client = HuggingFaceChatCompletionClient(model_name="test/model", use_auth_token="test-token")
     
     mock_auto_model.from_pretrained.assert_called_once()
     mock_auto_tokenizer.from_pretrained.assert_called_once()
 
-def test_init_uses_auth_token(mock_auto_model, mock_auto_tokenizer, monkeypatch):
+def test_init_uses_auth_token(mock_auto_model, mock_auto_tokenizer, mocker):
     """Test that auth token is used correctly."""
-    monkeypatch.setenv("HUGGINGFACE_TOKEN", "test-token")
+    # Without a GPU the weights default to fp32
+    mocker.patch("autogen_mem0.models._huggingface.torch.cuda.is_available", return_value=False)
     
-    client = HuggingFaceChatCompletionClient(model_name="test/model")
+    client = HuggingFaceChatCompletionClient(model_name="test/model", use_auth_token="test-token")
     
     mock_auto_model.from_pretrained.assert_called_with(
         "test/model",
         device_map="auto",
-        torch_dtype="auto",
         use_auth_token="test-token",
         trust_remote_code=True,
+        torch_dtype=torch.float32,
+    )
+
+@pytest.mark.parametrize("torch_dtype, expected", [
+    ("float16", torch.float16),
+    ("auto", torch.float32),
+])
+def test_init_nf4_uses_resolved_compute_dtype(mock_auto_model, mock_auto_tokenizer, mocker, torch_dtype, expected):
+    """Test that nf4 computes in the configured dtype, falling back to the machine default."""
+    mocker.patch("autogen_mem0.models._huggingface.torch.cuda.is_available", return_value=False)
+    mock_bnb = mocker.patch("autogen_mem0.models._huggingface.BitsAndBytesConfig")
+    
+    HuggingFaceChatCompletionClient(
+        model_name="test/model",
+        use_auth_token="test-token",
+        quantization="nf4",
+        torch_dtype=torch_dtype,
     )
+    
+    assert mock_bnb.call_args.kwargs["bnb_4bit_compute_dtype"] is expected
+
+def test_init_compiles_model_when_requested(mock_auto_model, mock_auto_tokenizer, mock_model, mocker):
+    """Test that torch_compile compiles the forward pass and warms up once."""
+    mock_compile = mocker.patch("autogen_mem0.models._huggingface.torch.compile")
+    
+    client = HuggingFaceChatCompletionClient(
+        model_name="test/model",
+        use_auth_token="test-token",
+        torch_compile=True,
+    )
+    
+    mock_compile.assert_called_once()
+    assert mock_compile.call_args.kwargs["mode"] == "reduce-overhead"
+    assert client._model.forward is mock_compile.return_value
+    mock_model.generate.assert_called_once()
 
 def test_convert_messages_basic(client):
     """Test basic message conversion."""
     messages = [
-        LLMMessage(role="user", content="Hello"),
-        LLMMessage(role="assistant", content="Hi"),
+        _message("user", "Hello"),
+        _message("assistant", "Hi"),
     ]
     
     result = client._convert_messages(messages)
@@ -98,8 +176,8 @@ def test_convert_messages_basic(client):
 def test_convert_messages_with_system(client):
     """Test message conversion with system message."""
     messages = [
-        LLMMessage(role="system", content="Be helpful"),
-        LLMMessage(role="user", content="Hello"),
+        _message("system", "Be helpful"),
+        _message("user", "Hello"),
     ]
     
     result = client._convert_messages(messages)
@@ -107,13 +185,13 @@ def test_convert_messages_with_system(client):
     assert "System: Be helpful" in result
     assert "Human: Hello" in result
 
-def test_convert_messages_with_template(client, mock_tokenizer):
+def test_convert_messages_with_template(client, mock_tokenizer, mocker):
     """Test message conversion with chat template."""
     mock_tokenizer.chat_template = True
-    mock_tokenizer.apply_chat_template.return_value = "Template output"
+    mock_tokenizer.apply_chat_template = mocker.Mock(return_value="Template output")
     
     messages = [
-        LLMMessage(role="user", content="Hello"),
+        _message("user", "Hello"),
     ]
     
     result = client._convert_messages(messages)
@@ -124,7 +202,7 @@ def test_convert_messages_with_template(client, mock_tokenizer):
 @pytest.mark.asyncio
 async def test_create(client):
     """Test create method."""
-    messages = [LLMMessage(role="user", content="Hello")]
+    messages = [_message("user", "Hello")]
     
     result = await client.create(messages)
     
@@ -134,8 +212,8 @@ async def test_create(client):
 
 @pytest.mark.asyncio
 async def test_create_with_tools(client):
-    """Test create method with tools."""
-    messages = [LLMMessage(role="user", content="Hello")]
+    """Test that create rejects tools, since function calling is not supported."""
+    messages = [_message("user", "Hello")]
     tools = [
         {
             "name": "test_tool",
@@ -143,15 +221,20 @@ async def test_create_with_tools(client):
         }
     ]
     
-    result = await client.create(messages, tools=tools)
-    
-    assert result.content == "Test response"
-    assert "test_tool" in client._convert_messages(messages)
+    with pytest.raises(ValueError, match="function calling"):
+        await client.create(messages, tools=tools)
 
 @pytest.mark.asyncio
-async def test_create_stream(client, mock_tokenizer):
+async def test_create_stream(client, mock_tokenizer, mock_model):
     """Test create_stream method."""
-    messages = [LLMMessage(role="user", content="Hello")]
+    def generate(**kwargs):
+        # Feed the streamer like generate() does: the prompt first, then new tokens
+        streamer = kwargs["streamer"]
+        streamer.put(_GEN_OUT)
+        streamer.put(torch.tensor([4]))
+        streamer.end()
+    mock_model.generate.side_effect = generate
+    messages = [_message("user", "Hello")]
     
     stream = client.create_stream(messages)
     chunks = [chunk async for chunk in stream]
@@ -159,16 +242,33 @@ async def test_create_stream(client, mock_tokenizer):
     assert len(chunks) > 0
     assert isinstance(chunks[0], str)
 
-def test_token_counting(client):
+def test_token_counting(client, mock_tokenizer, mocker):
     """Test token counting methods."""
-    messages = [LLMMessage(role="user", content="Hello")]
+    mock_tokenizer.encode = mocker.Mock(return_value=_ENC_OUT)
+    messages = [_message("user", "Hello")]
     
     count = client.count_tokens(messages)
     assert count == 3  # Length of mock encode output
+    # The rendered prompt is counted, not the bare message contents
+    mock_tokenizer.encode.assert_called_with(client._convert_messages(messages))
     
     remaining = client.remaining_tokens(messages)
     assert remaining == 2045  # 2048 - 3
 
+def test_generate_batch_counts_tokens_up_to_eos(client, mock_tokenizer, mock_model, mocker):
+    """Completion tokens stop at the first eos, even though padding reuses the eos id."""
+    mock_tokenizer.encode_call = mocker.Mock(return_value={"input_ids": [[5, 6], [7]]})
+    mock_tokenizer.batch_decode = mocker.Mock(return_value=["first", "second"])
+    # Prompts are left-padded to two tokens; eos (2) also pads the row that finished first
+    mock_model.generate.return_value = torch.tensor([
+        [5, 6, 8, 9, 2, 2],
+        [2, 7, 8, 2, 2, 2],
+    ])
+    
+    results = client._generate_batch(["Hello", "Hi"])
+    
+    assert results == [("first", 2, 3), ("second", 1, 2)]
+
 def test_usage_tracking(client):
     """Test usage tracking."""
     assert client.actual_usage().prompt_tokens == 0
@@ -197,6 +297,7 @@ def test_custom_capabilities(mock_auto_model, mock_auto_tokenizer):
     
     client = HuggingFaceChatCompletionClient(
         model_name="test/model",
+        use_auth_token="test-token",
         model_capabilities=custom_caps,
     )
     
@@ -0,0 +1,31 @@
+"""Tests for the Anthropic model information table."""
+
+from math import isclose
+
+import numpy as np
+
+from autogen_mem0.models._model_info import calculate_cost, calculate_cost_batch
+
+def test_calculate_cost_batch_matches_calculate_cost():
+    """Batch costs agree with calculate_cost for canonical names, aliases and unknown models."""
+    models = [
+        "claude-3-opus-20240229",  # canonical
+        "claude-3-5-sonnet-latest",  # pointer
+        "anthropic.claude-3-haiku-20240307-v1:0",  # Bedrock alias
+        "claude-3-5-haiku@20241022",  # Vertex alias
+        "not-a-model",  # unknown, priced at zero
+    ]
+    input_tokens = [1_000, 250_000, 17, 0, 5_000]
+    output_tokens = [500, 8_192, 3, 4_096, 5_000]
+
+    costs = calculate_cost_batch(models, input_tokens, output_tokens)
+
+    assert isinstance(costs, np.ndarray)
+    assert costs.shape == (len(models),)
+    for cost, model, inp, out in zip(costs, models, input_tokens, output_tokens):
+        assert isclose(cost, calculate_cost(model, inp, out), rel_tol=1e-12, abs_tol=1e-12)
+    assert costs[-1] == 0.0
+
+def test_calculate_cost_batch_empty():
+    """No requests cost nothing."""
+    assert calculate_cost_batch([], [], []).shape == (0,)
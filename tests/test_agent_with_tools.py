@@ -1,8 +1,8 @@
 """Test agent with tool capabilities."""
 
 import asyncio
-from datetime import datetime
 import logging
+import time
 import pytest
 
 from dotenv import load_dotenv
@@ -25,12 +25,23 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Last formatted time, reused for calls within the same second
+_last_second = -1
+_last_time = ""
+
 async def get_current_time() -> str:
     """Get the current time."""
-    current_time = datetime.now().strftime("%H:%M:%S")
+    global _last_second, _last_time
+    now = int(time.time())
+    if now != _last_second:
+        _last_second, _last_time = now, time.strftime("%H:%M:%S", time.localtime(now))
+    current_time = _last_time
     logger.info(f"[TOOL] get_current_time called, returning: {current_time}")
     return current_time
 
+# Built once; FunctionTool derives its argument model from the signature
+_TIME_TOOL = FunctionTool(get_current_time, description="Get the current time")
+
 @pytest.mark.asyncio
 async def test_agent_with_tools() -> None:
     """Test a MemoryEnabledAssistant using time tool."""
@@ -52,9 +63,8 @@ async def test_agent_with_tools() -> None:
         ),
         model_client=model,
         system_message="You are a helpful assistant that can tell the time.",
-        tools=[
-            FunctionTool(get_current_time, description="Get the current time")
-        ]
+        # A fresh list, since the agent appends its memory tools to it
+        tools=[_TIME_TOOL]
     )
 
     # Test sequence
@@ -0,0 +1,200 @@
+"""Tests for the function-based memory tools."""
+
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from autogen_mem0.core.tools.common import (
+    FunctionBasedRecallTool,
+    GetRelatedEntitiesInput,
+    GetRelatedEntitiesTool,
+    MemoryCaps,
+    RecallMemoryInput,
+    RecallMemoryOutput,
+    RecallMemoryTool,
+    StoreMemoryInput,
+    StoreMemoryTool,
+    StoreRelationshipInput,
+    StoreRelationshipTool,
+)
+
+_RESULTS = [
+    {"memory": "Paris is the capital of France", "metadata": {"topic": "geography"}},
+    {"memory": "Mozart wrote The Magic Flute", "metadata": {"topic": "music"}},
+]
+
+@pytest.fixture
+def recall_calls():
+    """Filters each call to the recall function received."""
+    return []
+
+@pytest.fixture
+def recall_fn(recall_calls):
+    """Custom recall function that records its filters and returns fixed results."""
+    async def recall(query, store_type, limit, **filters):
+        recall_calls.append(filters)
+        return {"results": list(_RESULTS), "relations": []}
+    return recall
+
+@pytest.mark.asyncio
+async def test_recall_splits_indexed_and_post_filters(recall_fn, recall_calls):
+    """Only indexed filter keys reach the function; the rest filter its results."""
+    recall_fn.__indexed_filters__ = {"user_id"}
+    tool = FunctionBasedRecallTool(recall_fn)
+
+    output = await tool.run(RecallMemoryInput(query="facts", user_id="alice", filters={"topic": "geography"}))
+
+    assert recall_calls == [{"user_id": "alice"}]
+    assert isinstance(output, RecallMemoryOutput)
+    assert [item["memory"] for item in output.results] == ["Paris is the capital of France"]
+
+@pytest.mark.asyncio
+async def test_recall_passes_every_filter_without_index(recall_fn, recall_calls):
+    """Functions that declare no indexed filters receive them all, without a scope."""
+    tool = FunctionBasedRecallTool(recall_fn)
+
+    output = await tool.run(RecallMemoryInput(query="facts", filters={"topic": "geography"}))
+
+    assert recall_calls == [{"topic": "geography"}]
+    assert len(output.results) == 2
+
+class _FakeGraph:
+    """Graph backend holding nodes the way mem0 writes them, with only a name and user_id.
+
+    query honours the relationship type and every ``n.<prop> = $<param>`` or
+    ``m.<prop> = $<param>`` condition whose parameter is set, as Neo4j would.
+    """
+
+    def __init__(self, edges):
+        self.edges = edges
+
+    def query(self, cypher, params):
+        conditions = [
+            (node, prop, param)
+            for node, prop, param in re.findall(r"\b([nm])\.(\w+) = \$(\w+)", cypher)
+            if params.get(param) is not None
+        ]
+        rows = []
+        for source, relationship, destination in self.edges:
+            if params["entity"] not in (source["name"], destination["name"]):
+                continue
+            if params["relationship_type"] not in (None, relationship):
+                continue
+            n, m = (source, destination) if source["name"] == params["entity"] else (destination, source)
+            nodes = {"n": n, "m": m}
+            if all(nodes[node].get(prop) == params[param] for node, prop, param in conditions):
+                rows.append({"source": source["name"], "relationship": relationship, "destination": destination["name"]})
+        return rows[:params["limit"]]
+
+@pytest.fixture
+def related_entities_tool():
+    """GetRelatedEntitiesTool over a fake graph with edges for two users."""
+    alice, paris = {"name": "alice", "user_id": "alice"}, {"name": "paris", "user_id": "alice"}
+    bob, rome = {"name": "alice", "user_id": "bob"}, {"name": "rome", "user_id": "bob"}
+    graph = _FakeGraph([(alice, "lives_in", paris), (bob, "visited", rome)])
+    memory = SimpleNamespace(graph=SimpleNamespace(graph=graph))
+    return GetRelatedEntitiesTool(memory, MemoryCaps(has_vector=False, has_graph=True))
+
+@pytest.mark.asyncio
+async def test_related_entities_scoped_to_user(related_entities_tool):
+    """Only the requesting user's edges come back."""
+    results = await related_entities_tool.run(GetRelatedEntitiesInput(entity="Alice", user_id="alice"))
+
+    assert results == [{"source": "alice", "relationship": "lives_in", "destination": "paris"}]
+
+@pytest.mark.asyncio
+async def test_related_entities_ignore_agent_and_run_scope(related_entities_tool):
+    """Graph nodes carry no agent_id or run_id, so those scopes do not empty the lookup."""
+    results = await related_entities_tool.run(
+        GetRelatedEntitiesInput(entity="alice", user_id="alice", agent_id="helper", run_id="run-1")
+    )
+
+    assert results == [{"source": "alice", "relationship": "lives_in", "destination": "paris"}]
+
+class _FakeMemory:
+    """mem0 Memory double that counts searches."""
+
+    def __init__(self):
+        self.searches = 0
+
+    def search(self, query, user_id=None, agent_id=None, run_id=None, limit=10, filters=None):
+        self.searches += 1
+        return {"results": [{"memory": "Paris is the capital of France"}], "relations": []}
+
+    def add(self, messages, user_id=None, agent_id=None, run_id=None, metadata=None):
+        return {"results": [], "relations": []}
+
+@pytest.fixture
+def fake_memory():
+    """Fake memory with vector search and a graph that accepts writes."""
+    memory = _FakeMemory()
+
+    async def graph_add(data, filters):
+        return {"results": [], "relations": [data]}
+    memory.graph = SimpleNamespace(add=graph_add)
+    return memory
+
+@pytest.mark.asyncio
+async def test_recall_cache_returns_copies(fake_memory):
+    """Repeated recalls are served from the cache, and callers never share an output."""
+    tool = RecallMemoryTool(fake_memory)
+    args = RecallMemoryInput(query="capital", user_id="alice")
+
+    first = await tool.run(args)
+    first.results.clear()
+    second = await tool.run(args)
+
+    assert fake_memory.searches == 1
+    assert [item["memory"] for item in second.results] == ["Paris is the capital of France"]
+    assert second is not await tool.run(args)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scope", [
+    {"user_id": "alice"},
+    {"agent_id": "helper"},
+    {"run_id": "run-1"},
+])
+async def test_store_invalidates_recalls_sharing_a_scope_field(fake_memory, scope):
+    """A store drops cached recalls that share any of its user, agent or run ids."""
+    recall = RecallMemoryTool(fake_memory)
+    args = RecallMemoryInput(query="capital", **scope)
+    await recall.run(args)
+
+    await StoreMemoryTool(fake_memory).run(
+        StoreMemoryInput(messages="Rome is the capital of Italy", user_id="alice", agent_id="helper", run_id="run-1")
+    )
+    await recall.run(args)
+
+    assert fake_memory.searches == 2
+
+@pytest.mark.asyncio
+async def test_store_keeps_recalls_for_other_scopes(fake_memory):
+    """Recalls scoped to someone else stay cached."""
+    recall = RecallMemoryTool(fake_memory)
+    args = RecallMemoryInput(query="capital", user_id="bob")
+    await recall.run(args)
+
+    await StoreMemoryTool(fake_memory).run(StoreMemoryInput(messages="Rome is the capital of Italy", user_id="alice"))
+    await recall.run(args)
+
+    assert fake_memory.searches == 1
+
+@pytest.mark.asyncio
+async def test_graph_write_invalidates_recalls(fake_memory):
+    """Recalls include graph relations, so relationship writes drop them too."""
+    recall = RecallMemoryTool(fake_memory)
+    args = RecallMemoryInput(query="capital", user_id="alice")
+    await recall.run(args)
+
+    await StoreRelationshipTool(fake_memory, MemoryCaps(has_vector=True, has_graph=True)).run(StoreRelationshipInput(
+        source="paris",
+        destination="france",
+        relationship="capital_of",
+        source_type="city",
+        destination_type="country",
+        user_id="alice",
+    ))
+    await recall.run(args)
+
+    assert fake_memory.searches == 2